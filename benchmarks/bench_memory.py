@@ -0,0 +1,49 @@
+"""Measure peak memory allocated by `loader.load` for cases with big payloads.
+
+Run with `python benchmarks/bench_memory.py [rows] [payload_mb]`."""
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from types import ModuleType, SimpleNamespace
+from typing import Any, Dict, List, cast
+
+from pytest_embrace.case import CaseTypeInfo
+from pytest_embrace.loader import ModuleInfo, load
+
+
+@dataclass
+class PayloadCase:
+    name: str
+    payload: Any
+    lookup: Dict[str, Any]
+
+
+def payload(megabytes: int) -> List[List[float]]:
+    # a list of 1k floats is roughly 32KB once you count the float objects
+    return [[float(i) for i in range(1000)] for _ in range(megabytes * 32)]
+
+
+def main(rows: int = 20, payload_mb: int = 4) -> None:
+    table = [
+        PayloadCase(
+            name=f"row-{i}", payload=payload(payload_mb), lookup={"big": payload(1)}
+        )
+        for i in range(rows)
+    ]
+    module = cast(ModuleType, SimpleNamespace(__name__="test_bench", table=table))
+    info = CaseTypeInfo(PayloadCase, fixture_name="payload_case")
+
+    tracemalloc.start()
+    load(ModuleInfo(case_type_info=info, module=module))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"load() of {rows} rows carrying ~{payload_mb + 1}MB each:"
+        f" peak {peak / 2**20:.1f}MB allocated"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,97 @@
+"""Measure the per-test overhead of Embrace fixtures over plain parametrization.
+
+Runs a generated suite twice in a fresh pytest process: once through an Embrace
+fixture taking a few other fixtures, once as a `pytest.mark.parametrize` test
+taking the same ones. The difference, divided by the number of rows, is what
+each Embrace test costs on top.
+
+Run with `python benchmarks/bench_overhead.py [rows]`."""
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CONFTEST = """
+from dataclasses import dataclass
+
+import pytest
+
+from pytest_embrace import Embrace
+
+
+@dataclass
+class OverheadCase:
+    n: int
+
+
+@pytest.fixture
+def first():
+    return 1
+
+
+@pytest.fixture
+def second(first):
+    return first + 1
+
+
+@pytest.fixture(scope="module")
+def third():
+    return 3
+
+
+embrace = Embrace(OverheadCase, ids="index")
+
+
+@embrace.fixture
+def overhead_case(case: OverheadCase, first, second, third):
+    return case.n + first + second + third
+"""
+
+EMBRACE_MODULE = """
+from conftest import OverheadCase
+
+table = [OverheadCase(n=n) for n in range({rows})]
+
+
+def test(overhead_case):
+    assert overhead_case.actual_result == overhead_case.case.n + 6
+"""
+
+PLAIN_MODULE = """
+import pytest
+
+
+@pytest.mark.parametrize("n", range({rows}))
+def test(n, first, second, third):
+    assert n + first + second + third == n + 6
+"""
+
+
+def run_suite(directory: Path, module: str, rows: int) -> float:
+    (directory / "test_suite.py").write_text(module.format(rows=rows))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-x"],
+        cwd=directory,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main(rows: int = 5_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        (directory / "conftest.py").write_text(CONFTEST)
+        plain = run_suite(directory, PLAIN_MODULE, rows)
+        embrace = run_suite(directory, EMBRACE_MODULE, rows)
+    print(f"{rows} plain parametrized tests: {plain:.2f}s")
+    print(f"{rows} Embrace tests: {embrace:.2f}s")
+    print(f"overhead per Embrace test: {(embrace - plain) / rows * 1e6:.0f}µs")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,58 @@
+"""Time `loader.load` on a single module holding a large `table`, and the
+compiled checks (see fastcheck.py) that let it skip pydantic for valid rows.
+
+Run with `python benchmarks/bench_validation.py [rows]`."""
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import dataclass
+from types import ModuleType, SimpleNamespace
+from typing import Dict, List, cast
+
+from pytest_embrace.case import CaseTypeInfo, trickles
+from pytest_embrace.fastcheck import checker
+from pytest_embrace.loader import ModuleInfo, load
+
+
+@dataclass
+class BenchCase:
+    name: str
+    count: int
+    ratio: float
+    tags: List[str]
+    extra: Dict[str, int]
+    flag: bool = trickles()
+
+
+def build_module(rows: int) -> ModuleType:
+    table = [
+        BenchCase(
+            name=f"row-{i}", count=i, ratio=i / 3, tags=["a", "b"], extra={"i": i}
+        )
+        for i in range(rows)
+    ]
+    return cast(
+        ModuleType, SimpleNamespace(__name__="test_bench", flag=True, table=table)
+    )
+
+
+def main(rows: int = 10_000) -> None:
+    info = CaseTypeInfo(BenchCase, fixture_name="bench_case")
+    module = build_module(rows)
+    start = time.perf_counter()
+    loaded = load(ModuleInfo(case_type_info=info, module=module))
+    elapsed = time.perf_counter() - start
+    assert len(loaded) == rows
+    print(f"load() of a {rows}-row table: {elapsed:.3f}s")
+
+    check = checker(BenchCase)
+    assert check is not None
+    start = time.perf_counter()
+    assert all(check(case) for case in loaded)
+    elapsed = time.perf_counter() - start
+    print(f"compiled checks of {rows} rows: {elapsed * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,246 @@
+"""Benchmark pytest-embrace on a generated suite and catch regressions.
+
+The suite has `--modules` test modules, each with a `--rows`-row table of a wide
+case type (`--width` plain attributes on top of nested dataclasses, trickles and
+an attribute derived from the file name). Measured, each as the best of
+`--repeat` runs in a fresh process:
+
+- collect_seconds: `pytest --collect-only` over the suite.
+- collect_peak_mb: peak memory allocated by that collection, per tracemalloc.
+- overhead_us_per_test: what an Embrace test costs over a plain parametrized one
+  (see bench_overhead.py).
+- render_ms: rendering a new test module for the case type, as `--embrace` does.
+
+Results are written as JSON. Given a `--baseline` results file, any metric more
+than `--threshold` (a fraction) worse than it fails the run.
+
+Run with `python benchmarks/harness.py [--output results.json] [--baseline ...]`."""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from textwrap import dedent
+from typing import Dict, List
+
+from bench_overhead import CONFTEST as OVERHEAD_CONFTEST
+from bench_overhead import EMBRACE_MODULE, PLAIN_MODULE, run_suite
+
+Metrics = Dict[str, float]
+
+
+def conftest(width: int) -> str:
+    plain = "\n".join(
+        f"    attr_{i}: int = 0" if i % 2 else f"    attr_{i}: str = ''"
+        for i in range(width)
+    )
+    return dedent(
+        """
+        from dataclasses import dataclass
+        from typing import Dict, List
+
+        from pytest_embrace import Embrace, derive_from_filename, trickles
+
+
+        @dataclass
+        class Point:
+            x: int
+            y: int
+            label: str
+
+
+        @dataclass
+        class WideCase:
+            name: str
+            origin: Point
+            path: List[Point]
+            weights: Dict[str, float]
+            suite: str = derive_from_filename()
+            tolerance: float = trickles()
+            mode: str = trickles(no_override=True)
+        {plain}
+
+
+        embrace = Embrace(WideCase)
+
+
+        @embrace.fixture
+        def wide_case(case: WideCase) -> int:
+            return sum(point.x for point in case.path)
+        """
+    ).format(plain=plain)
+
+
+MODULE = """
+from conftest import Point, WideCase
+
+tolerance = 0.5
+mode = "fast"
+
+table = [
+    WideCase(
+        name=f"row-{{i}}",
+        origin=Point(x=i, y=-i, label="origin"),
+        path=[Point(x=j, y=i, label="step") for j in range(3)],
+        weights={{"a": 1.0, "b": i / 2}},
+        **{{f"attr_{{k}}": (i if k % 2 else str(i)) for k in range({width})}},
+    )
+    for i in range({rows})
+]
+
+
+def test(wide_case):
+    assert wide_case.actual_result == 3
+"""
+
+COLLECT_PEAK = """
+import tracemalloc
+
+import pytest
+
+tracemalloc.start()
+pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider"])
+print("PEAK", tracemalloc.get_traced_memory()[1])
+"""
+
+RENDER = """
+import time
+
+import conftest
+from pytest_embrace.codegen import CodeGenManager
+from pytest_embrace.embrace import registry
+
+manager = CodeGenManager("wide_case", registry=registry())
+manager.render()  # warm up imports
+start = time.perf_counter()
+for _ in range(20):
+    manager.render()
+print("RENDER", (time.perf_counter() - start) / 20)
+"""
+
+
+def write_suite(directory: Path, modules: int, rows: int, width: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "conftest.py").write_text(conftest(width))
+    for i in range(modules):
+        module = MODULE.format(rows=rows, width=width)
+        (directory / f"test_suite_{i}.py").write_text(module)
+
+
+def run(directory: Path, *args: str) -> str:
+    done = subprocess.run(
+        [sys.executable, *args],
+        cwd=directory,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return done.stdout
+
+
+def timed(directory: Path, *args: str) -> float:
+    start = time.perf_counter()
+    run(directory, "-m", "pytest", *args)
+    return time.perf_counter() - start
+
+
+def _reading(output: str, label: str) -> float:
+    for line in output.splitlines():
+        if line.startswith(f"{label} "):
+            return float(line.split()[1])
+    raise RuntimeError(f"no {label} reading in:\n{output}")
+
+
+def measure(args: argparse.Namespace) -> Metrics:
+    with tempfile.TemporaryDirectory() as tmp:
+        suite = Path(tmp) / "suite"
+        write_suite(suite, args.modules, args.rows, args.width)
+        collect = [
+            timed(suite, "--collect-only", "-q", "-p", "no:cacheprovider")
+            for _ in range(args.repeat)
+        ]
+        peak = _reading(run(suite, "-c", COLLECT_PEAK), "PEAK")
+        render = _reading(run(suite, "-c", RENDER), "RENDER")
+
+        overhead = Path(tmp) / "overhead"
+        overhead.mkdir()
+        (overhead / "conftest.py").write_text(OVERHEAD_CONFTEST)
+        differences = [
+            run_suite(overhead, EMBRACE_MODULE, args.overhead_rows)
+            - run_suite(overhead, PLAIN_MODULE, args.overhead_rows)
+            for _ in range(args.repeat)
+        ]
+
+    return {
+        "collect_seconds": min(collect),
+        "collect_peak_mb": peak / 2**20,
+        "overhead_us_per_test": min(differences) / args.overhead_rows * 1e6,
+        "render_ms": render * 1e3,
+    }
+
+
+def regressions(current: Metrics, baseline: Metrics, threshold: float) -> List[str]:
+    """Every metric is 'lower is better'."""
+    return [
+        f"{name}: {current[name]:.3f} vs {baseline[name]:.3f} in the baseline"
+        for name in current
+        if name in baseline and current[name] > baseline[name] * (1 + threshold)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--overhead-rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    metrics = measure(args)
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "suite": {
+            "modules": args.modules,
+            "rows": args.rows,
+            "width": args.width,
+            "overhead_rows": args.overhead_rows,
+        },
+        "metrics": metrics,
+    }
+    for name, value in metrics.items():
+        print(f"{name}: {value:.3f}")
+    # read before writing, in case the baseline is also the output
+    baseline = (
+        json.loads(args.baseline.read_text())
+        if args.baseline is not None and args.baseline.exists()
+        else None
+    )
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if baseline is None:
+        if args.baseline is not None:
+            print(f"no baseline at {args.baseline}, nothing to compare against")
+        return 0
+    if baseline["suite"] != results["suite"]:
+        print("the baseline was measured on a different suite, not comparing")
+        return 0
+    worse = regressions(metrics, baseline["metrics"], args.threshold)
+    for line in worse:
+        print(f"REGRESSION {line}")
+    return 1 if worse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,28 @@ from __future__ import annotations
 
 __version__ = "4.0.0"
 
+from typing import TYPE_CHECKING, Any
 
 from .case import CaseArtifact as CaseArtifact
 from .case import derive_from_filename as derive_from_filename
 from .case import trickles as trickles
-from .codegen import RenderModuleBody as RenderModuleBody
-from .codegen import RenderText as RenderText
 from .embrace import Embrace as Embrace
 
+if TYPE_CHECKING:
+    from .codegen import RenderModuleBody as RenderModuleBody
+    from .codegen import RenderText as RenderText
+
+# codegen pulls in black, isort and pyperclip, which plain test runs never need.
+_LAZY_CODEGEN_ATTRS = {"RenderModuleBody", "RenderText"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_CODEGEN_ATTRS:
+        from . import codegen
+
+        return getattr(codegen, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # defining __all__ for the sake of generating docs with pdoc
 __all__ = ["CaseArtifact", "derive_from_filename", "trickles", "Embrace"]
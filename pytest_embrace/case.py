@@ -6,10 +6,22 @@ import re
 import sys
 from dataclasses import _MISSING_TYPE, MISSING, Field, dataclass, field, fields
 from types import MappingProxyType
-from typing import Any, Callable, Dict, Generic, Mapping, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pytest_embrace.anno import AnnotationInfo, get_pep_593_values
 from pytest_embrace.exc import CaseConfigurationError
+from pytest_embrace.ids import IdStrategy
 
 CaseType = TypeVar("CaseType")
 CoCaseType = TypeVar("CoCaseType", contravariant=True)
@@ -52,13 +64,19 @@ class CaseTypeInfo(Generic[CaseCls]):
     type_attrs: Dict[str, AttrInfo] = field(default_factory=dict)
     generators: Dict[str, Callable[..., CaseCls]] = field(default_factory=dict)
     skip_validation: bool = False
+    ids: Optional[IdStrategy] = None
+    # built lazily by the loader the first time a case of this type is validated
+    validator: Any = field(default=None, init=False, repr=False, compare=False)
+    table_validator: Any = field(default=None, init=False, repr=False, compare=False)
+    plan: "FieldPlan" = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.type_name = self.type.__name__
-        self.type_annotations = get_pep_593_values(self.type)
+        self.plan = FieldPlan.compile(self.type)
+        self.type_annotations = self.plan.annotations
         self.type_attrs = {
-            f.name: AttrInfo(dc_field=f, annotations=self.type_annotations.get(f.name))
-            for f in fields(self.type)
+            name: AttrInfo(dc_field=f, annotations=self.type_annotations.get(name))
+            for name, f in self.plan.fields.items()
         }
 
 
@@ -187,3 +205,54 @@ class DeriveFromFileName:
         extracted = match.group(1)
 
         return self.parse(extracted)
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """Everything the loader, validators and codegen need to know about
+    the fields of a case type. Compiled once per type by CaseTypeInfo."""
+
+    names: Tuple[str, ...]
+    fields: Mapping[str, Field]
+    defaults: Mapping[str, Any]
+    default_factories: Mapping[str, Callable[[], Any]]
+    trickles: Mapping[str, Trickle]
+    filename_derivers: Mapping[str, DeriveFromFileName]
+    annotations: Mapping[str, AnnotationInfo]
+
+    def values(self, case: Any) -> Dict[str, Any]:
+        """Shallowly read every field of a case, in order. Nothing is copied."""
+        return {name: getattr(case, name) for name in self.names}
+
+    @classmethod
+    def compile(cls, case_type: Type) -> "FieldPlan":
+        fields_ = {f.name: f for f in fields(case_type)}
+        return cls(
+            names=tuple(fields_),
+            fields=MappingProxyType(fields_),
+            defaults=MappingProxyType(
+                {k: f.default for k, f in fields_.items() if f.default is not MISSING}
+            ),
+            default_factories=MappingProxyType(
+                {
+                    k: f.default_factory
+                    for k, f in fields_.items()
+                    if f.default_factory is not MISSING
+                }
+            ),
+            trickles=MappingProxyType(
+                {
+                    k: trickle
+                    for k, f in fields_.items()
+                    if (trickle := f.metadata.get("trickle")) is not None
+                }
+            ),
+            filename_derivers=MappingProxyType(
+                {
+                    k: derive
+                    for k, f in fields_.items()
+                    if (derive := f.metadata.get("derive_from_filename")) is not None
+                }
+            ),
+            annotations=MappingProxyType(get_pep_593_values(case_type)),
+        )
@@ -4,7 +4,7 @@ import json
 import re
 from collections import defaultdict
 from collections.abc import Iterator
-from dataclasses import asdict
+from dataclasses import MISSING, asdict
 from inspect import getmodule
 from operator import itemgetter
 from textwrap import dedent
@@ -148,12 +148,13 @@ class CaseRender(Generic[CaseType]):
     def _with_values_from_case(self, case: CaseType, hinted: bool = True) -> str:
         assignments: list[str] = []
         values = asdict(case)
-        for name, attr in self.src.type_attrs.items():
+        plan = self.src.plan
+        for name in plan.names:
             value = values[name]
-            if callable(attr.dc_field.default_factory):
-                default = attr.dc_field.default_factory()
+            if name in plan.default_factories:
+                default = plan.default_factories[name]()
             else:
-                default = attr.dc_field.default
+                default = plan.defaults.get(name, MISSING)
 
             # would've expected value == default to be true w/ trickles() but appaz not!
             if value == default or isinstance(value, Trickle):
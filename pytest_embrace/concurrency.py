@@ -0,0 +1,180 @@
+"""Run the runner for many rows of one module at once, ahead of their tests.
+
+With `Embrace(concurrency=N)`, the first test of a module to need the fixture
+starts the runner for every selected row of that module: sync runners on a pool
+of N threads, async runners as tasks on the shared event loop, N at a time.
+Each test then waits for its own row, so every row is still reported on its own,
+with its own CaseArtifact, and runner cleanup still happens after each test.
+
+Fixtures other than `case` are resolved once and handed to the runner of every
+row, so Embrace.fixture requests them through a module-scoped fixture: pytest
+then refuses function-scoped ones, which the first test would tear down while
+other rows still use them.
+
+With `executor="process"`, rows run on a pool of worker processes instead, for
+CPU-bound runners. Workers can't be handed the runner itself, so they import
+the module that defines it and look it up there, by its qualified name. Pools
+live for the whole session, so that import is only paid once per worker."""
+from __future__ import annotations
+
+import asyncio
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from importlib import import_module
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+
+from . import runners
+from .preload import resolve_case
+
+Outcome = Callable[[], Tuple[Any, runners.Finish]]
+EXECUTORS = ("thread", "process")
+
+# (module, qualname) -> runner, for worker processes to find runners by name
+_runners: Dict[Tuple[str, str], Callable[..., Any]] = {}
+# max_workers -> pool, kept for the whole session
+_pools: Dict[int, ProcessPoolExecutor] = {}
+
+
+def register_runner(func: Callable[..., Any]) -> None:
+    _runners[func.__module__, func.__qualname__] = func
+
+
+def _find_runner(module: str, qualname: str) -> Callable[..., Any]:
+    if (module, qualname) not in _runners:
+        import_module(module)  # decorating the runner registers it
+    return _runners[module, qualname]
+
+
+def _init_worker(path: List[str]) -> None:
+    # workers are spawned fresh, so they need the parent's view of the imports
+    sys.path[:] = path
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    if max_workers not in _pools:
+        _pools[max_workers] = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(list(sys.path),),
+        )
+    return _pools[max_workers]
+
+
+def shutdown_process_pools() -> None:
+    for pool in _pools.values():
+        if sys.version_info >= (3, 9):
+            # rows started ahead of tests that never ran, e.g. after `-x`
+            pool.shutdown(cancel_futures=True)
+        else:  # pragma: no cover
+            pool.shutdown()
+    _pools.clear()
+
+
+def _run_in_process(module: str, qualname: str, kwargs: Dict[str, Any]) -> Any:
+    """Run a row start to finish, cleanup included, in a worker process."""
+    result, finish = runners.start(_find_runner(module, qualname)(**kwargs))
+    finish()
+    return result
+
+
+def _finished(future: "Future[Any]") -> Tuple[Any, runners.Finish]:
+    return future.result(), runners.nothing_to_finish
+
+
+class Batch:
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        fixture_name: str,
+        concurrency: int,
+        executor: str = "thread",
+    ):
+        self.func = func
+        self.fixture_name = fixture_name
+        self.concurrency = concurrency
+        self.executor = executor
+        # test node id -> how to get the (result, finish) pair of its row
+        self.pending: Dict[str, Outcome] = {}
+
+    def start(
+        self, request: pytest.FixtureRequest, kwargs: Dict[str, Any]
+    ) -> Tuple[Any, runners.Finish]:
+        """Like `runners.start`, but for the row of the requesting test."""
+        nodeid = request.node.nodeid
+        if nodeid not in self.pending:
+            self._schedule(request, kwargs)
+        if nodeid not in self.pending:
+            # not one of the collected items, somehow. just run it.
+            return runners.start(self.func(**kwargs))
+        return self.pending.pop(nodeid)()
+
+    def _rows(
+        self, request: pytest.FixtureRequest, kwargs: Dict[str, Any]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """The runner arguments for each selected test of the requesting module."""
+        for item in request.session.items:
+            if item.nodeid in self.pending:
+                continue
+            if getattr(item, "module", None) is not request.module:
+                continue
+            if self.fixture_name not in getattr(item, "fixturenames", ()):
+                continue
+            callspec = getattr(item, "callspec", None)
+            if callspec is None or "case" not in callspec.params:
+                continue
+            if "case" not in kwargs:
+                yield item.nodeid, kwargs
+                continue
+            yield item.nodeid, {**kwargs, "case": resolve_case(callspec.params["case"])}
+
+    def _schedule(self, request: pytest.FixtureRequest, kwargs: Dict[str, Any]) -> None:
+        rows = self._rows(request, kwargs)
+        if self.executor == "process":
+            self._schedule_processes(rows)
+        elif runners.is_async(self.func):
+            self._schedule_tasks(rows)
+        else:
+            self._schedule_threads(rows)
+
+    def _schedule_threads(self, rows: Iterator[Tuple[str, Dict[str, Any]]]) -> None:
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="embrace"
+        )
+        for nodeid, row_kwargs in rows:
+            future = executor.submit(self._run, row_kwargs)
+            self.pending[nodeid] = future.result
+        # queued rows still run; the threads just go away once they're done
+        executor.shutdown(wait=False)
+
+    def _run(self, kwargs: Dict[str, Any]) -> Tuple[Any, runners.Finish]:
+        return runners.start(self.func(**kwargs))
+
+    def _schedule_processes(self, rows: Iterator[Tuple[str, Dict[str, Any]]]) -> None:
+        pool = process_pool(self.concurrency)
+        name = (self.func.__module__, self.func.__qualname__)
+        for nodeid, row_kwargs in rows:
+            future = pool.submit(_run_in_process, *name, row_kwargs)
+            self.pending[nodeid] = partial(_finished, future)
+
+    def _schedule_tasks(self, rows: Iterator[Tuple[str, Dict[str, Any]]]) -> None:
+        loop = runners.event_loop()
+        # made on the loop, as older asyncio binds semaphores to the current loop
+        semaphore = runners.run_async(_semaphore(self.concurrency))
+
+        async def run_row(kwargs: Dict[str, Any]) -> Tuple[Any, runners.Finish]:
+            async with semaphore:
+                return await runners.start_async(self.func(**kwargs))
+
+        for nodeid, row_kwargs in rows:
+            # tasks make progress whenever the loop runs, i.e. while any test waits
+            task = loop.create_task(run_row(row_kwargs))
+            self.pending[nodeid] = partial(runners.run_async, task)
+
+
+async def _semaphore(value: int) -> asyncio.Semaphore:
+    return asyncio.Semaphore(value)
@@ -0,0 +1,234 @@
+"""Collect Embrace cases straight from data files, without any Python test module.
+
+A data file names its Embrace fixture and holds module-level attributes and
+`table` rows. Data files are collected when their name starts with `test_`
+and they declare a fixture:
+
+JSON Lines, where the first line is the header and every other line is a row:
+
+    {"embrace": "my_fixture", "some_module_attr": 5}
+    {"attr": 1, "other_attr": "a"}
+
+CSV, where leading `# key: value` lines are the header, followed by the
+usual column names and rows. Cells of `str` attributes are kept as they are,
+others are read as JSON, falling back to plain strings. Empty cells are left out
+so defaults and trickles apply:
+
+    # embrace: my_fixture
+    # some_module_attr: 5
+    attr,other_attr
+    1,a
+
+TOML, with top-level keys as the header and `[[table]]` entries as rows:
+
+    embrace = "my_fixture"
+    some_module_attr = 5
+
+    [[table]]
+    attr = 1
+    other_attr = "a"
+"""
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from inspect import Parameter, Signature
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import pytest
+from typing_extensions import Annotated, Literal, get_args, get_origin, get_type_hints
+
+from .embrace import registry
+from .exc import CaseConfigurationError
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+FIXTURE_KEY = "embrace"
+DATA_FILE_MARKER = "__embrace_data_file__"
+
+Header = Dict[str, Any]
+RowReader = Callable[[], Iterator[Dict[str, Any]]]
+
+
+def _cell(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _is_text(hint: Any) -> bool:
+    """Whether an attribute only ever holds strings (or None)."""
+    origin, args = get_origin(hint), get_args(hint)
+    if origin is Annotated:
+        return _is_text(args[0])
+    if origin is Union:
+        return all(_is_text(arg) for arg in args if arg is not type(None))
+    if origin is Literal:
+        return all(isinstance(arg, str) for arg in args)
+    return hint is str or hint == "str"
+
+
+def _cells_reader(case_type: type) -> Callable[[Dict[str, str]], Dict[str, Any]]:
+    """Read CSV cells as the attributes of a case type: `90210` is a str for a
+    `str` attribute, and an int for the rest."""
+    try:
+        hints = get_type_hints(case_type, include_extras=True)
+    except Exception:  # unresolvable annotations, so go by what's written
+        hints = dict(getattr(case_type, "__annotations__", {}))
+    text = {name for name, hint in hints.items() if _is_text(hint)}
+
+    def read(cells: Dict[str, str]) -> Dict[str, Any]:
+        return {k: v if k in text else _cell(v) for k, v in cells.items()}
+
+    return read
+
+
+def _jsonl_header(path: Path) -> Optional[Header]:
+    with path.open(encoding="utf-8") as f:
+        first = f.readline()
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def _jsonl_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        f.readline()  # header
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _csv_header(path: Path) -> Header:
+    header: Header = {}
+    with path.open(encoding="utf-8", newline="") as f:
+        for line in f:
+            if not line.startswith("#"):
+                break
+            key, sep, value = line.lstrip("#").partition(":")
+            if sep:
+                # attributes are read once the case type is known, see build_module
+                key, value = key.strip(), value.strip()
+                header[key] = _cell(value) if key == FIXTURE_KEY else value
+    return header
+
+
+def _csv_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open(encoding="utf-8", newline="") as f:
+        lines = (line for line in f if not line.startswith("#"))
+        for row in csv.DictReader(lines):
+            yield {k: v for k, v in row.items() if v != ""}
+
+
+def _toml_document(path: Path) -> Dict[str, Any]:
+    with path.open("rb") as f:
+        return tomllib.load(f)
+
+
+def _toml_header(path: Path) -> Optional[Header]:
+    # only parse files that look like they're for us
+    with path.open(encoding="utf-8") as f:
+        if not any(line.lstrip().startswith(FIXTURE_KEY) for line in f):
+            return None
+    document = _toml_document(path)
+    return {k: v for k, v in document.items() if k != "table"}
+
+
+def _toml_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    # TOML has no streaming parser, so rows come from one parse of the file
+    yield from _toml_document(path).get("table", [])
+
+
+FORMATS: Dict[str, Tuple[Callable[[Path], Optional[Header]], Callable[[Path], Any]]] = {
+    ".jsonl": (_jsonl_header, _jsonl_rows),
+    ".csv": (_csv_header, _csv_rows),
+}
+if tomllib is not None:
+    FORMATS[".toml"] = (_toml_header, _toml_rows)
+
+
+def read_header(path: Path) -> Optional[Header]:
+    """Get the header of a data file, if it is an Embrace data file at all."""
+    if path.suffix not in FORMATS:
+        return None
+    read, _ = FORMATS[path.suffix]
+    try:
+        header = read(path)
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+    if header is None or not isinstance(header.get(FIXTURE_KEY), str):
+        return None
+    return header
+
+
+def build_module(path: Path, header: Header) -> ModuleType:
+    """Make a stand-in test module with the file's attributes, a lazy `table`
+    and a `test` function requesting the Embrace fixture."""
+    fixture_name = header[FIXTURE_KEY]
+    reg = registry()
+    if fixture_name not in reg:
+        raise CaseConfigurationError(
+            f"{path} wants Embrace fixture '{fixture_name}', which doesn't exist."
+            f" Your options are {sorted([*reg])}"
+        )
+    case_type = reg[fixture_name].type
+    _, read_rows = FORMATS[path.suffix]
+    # CSV only has text, which the case type's annotations make sense of
+    read_cells = _cells_reader(case_type) if path.suffix == ".csv" else dict
+    header = read_cells(header)
+
+    def table() -> Iterator[Any]:
+        for line, cells in enumerate(read_rows(path), start=1):
+            row = read_cells(cells)
+            try:
+                yield case_type(**row)
+            except TypeError as e:
+                raise CaseConfigurationError(
+                    f"Bad row {line} in {path}: {e}. Got attributes {row}"
+                ) from e
+
+    def test(**kwargs: Any) -> None:
+        """The Embrace fixture does all the work for data files."""
+
+    test.__signature__ = Signature(  # type: ignore
+        [Parameter(fixture_name, Parameter.POSITIONAL_OR_KEYWORD)]
+    )
+    # have pytest report the data file as the location of each test
+    test.compat_co_firstlineno = 0  # type: ignore
+
+    module = ModuleType(path.stem)
+    module.__file__ = str(path)
+    for name, value in header.items():
+        if name != FIXTURE_KEY:
+            setattr(module, name, value)
+    module.table = table  # type: ignore
+    module.test = test  # type: ignore
+    setattr(module, DATA_FILE_MARKER, True)
+    return module
+
+
+class DataModule(pytest.Module):
+    """Collects an Embrace data file like a test module."""
+
+    def __init__(self, *args: Any, header: Header, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.header = header
+
+    def _getobj(self) -> ModuleType:
+        return build_module(self.path, self.header)
+
+
+def is_data_module(module: ModuleType) -> bool:
+    return getattr(module, DATA_FILE_MARKER, False)
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import sys
 from collections.abc import Iterator
+from dataclasses import fields
 from functools import partial
-from inspect import signature
-from typing import Any, Callable, Generic
+from inspect import (
+    Parameter,
+    Signature,
+    isasyncgenfunction,
+    isgeneratorfunction,
+    signature,
+)
+from typing import Any, Callable, Generic, Iterable
 from typing import MutableMapping as TMutableMapping
 from typing import Type, TypeVar
 
 import pytest
 from typing_extensions import ParamSpec
 
+from . import runners
 from .case import CaseArtifact, CaseRunner, CaseType, CaseTypeInfo
+from .concurrency import EXECUTORS, Batch, register_runner
 from .exc import CaseConfigurationError
+from .ids import IdStrategy, id_maker
+from .memo import DEFAULT_CACHE_SIZE, MISSING, CacheKey, ResultCache
 
 RegistryValue = Type["CaseType"]
 
@@ -37,6 +49,10 @@ class CaseTypeRegistry(TMutableMapping[str, TCaseInfo]):
         existing = self.__dict__[key]
 
         if type(existing) == type(val):
+            if _same_name(existing.type, val.type):
+                # the case type's module was imported again. its cases will be
+                # made from the new class, so validate against that one.
+                self.__dict__[key] = val
             return
 
         raise CaseConfigurationError(
@@ -56,6 +72,10 @@ class CaseTypeRegistry(TMutableMapping[str, TCaseInfo]):
         return "\n".join(f"{name}  (via {cls})" for name, cls in self.items())
 
 
+def _same_name(a: type, b: type) -> bool:
+    return (a.__module__, a.__qualname__) == (b.__module__, b.__qualname__)
+
+
 _registry: CaseTypeRegistry[CaseTypeInfo] = CaseTypeRegistry()
 
 
@@ -64,13 +84,49 @@ class Embrace(Generic[CaseType]):
     Register a dataclass as a module test schema and create a configurator for defining
     how tests that implement it will run."""
 
-    def __init__(self, case_type: Type[CaseType], skip_validation: bool = False):
+    def __init__(
+        self,
+        case_type: Type[CaseType],
+        skip_validation: bool = False,
+        ids: IdStrategy | None = None,
+        concurrency: int = 1,
+        executor: str = "thread",
+        cache_key: CacheKey | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        scope: str = "function",
+    ):
+        if ids is not None:
+            id_maker(ids, case_type)  # fail fast on a bad strategy
+        if concurrency < 1:
+            raise CaseConfigurationError(
+                f"concurrency must be at least 1, got {concurrency}"
+            )
+        if executor not in EXECUTORS:
+            raise CaseConfigurationError(
+                f"executor must be one of {EXECUTORS}, got '{executor}'"
+            )
+        if scope not in runners.SCOPES:
+            raise CaseConfigurationError(
+                f"scope must be one of {runners.SCOPES}, got '{scope}'"
+            )
+        if scope != "function" and concurrency > 1:
+            raise CaseConfigurationError(
+                f"{scope}-scoped runners share one setup, so can't use concurrency."
+            )
+        if cache_key is not None:
+            _check_cache_key(case_type, cache_key, cache_size, concurrency)
         self.case_type = case_type
         self.wrapped_func: CaseRunner | None = None
         self.runner: partial | None = None
         self.generators: dict[str, Callable[..., Any]]
         self.fixture_name: str = ""
         self.skip_validation = skip_validation
+        self.ids = ids
+        self.concurrency = concurrency
+        self.executor = executor
+        self.cache_key = cache_key
+        self.cache_size = cache_size
+        self.scope = scope
 
     def fixture(
         self, func: CaseRunner
@@ -82,41 +138,120 @@ class Embrace(Generic[CaseType]):
         (during pytest_generate_tests) with CaseType objects built from enclosing test
         modules and then later calls that decorated function with fixture values."""
         self.fixture_name = func.__name__
+        if self.executor == "process" and [*signature(func).parameters] != ["case"]:
+            raise CaseConfigurationError(
+                f"{func.__name__} runs in worker processes, so it can only take"
+                " `case`, not other fixtures."
+            )
+        if self.concurrency > 1 and "request" in signature(func).parameters:
+            raise CaseConfigurationError(
+                f"{func.__name__} runs all the rows of a module at once, so it can't"
+                " take `request`, which belongs to a single test."
+            )
+        if (
+            self.cache_key is not None
+            and self.scope == "function"
+            and (isgeneratorfunction(func) or isasyncgenfunction(func))
+        ):
+            raise CaseConfigurationError(
+                f"{func.__name__} cleans up after each row, so rows with the same"
+                " cache_key can't reuse its results."
+            )
+        if self.cache_key is not None and "request" in signature(func).parameters:
+            raise CaseConfigurationError(
+                f"{func.__name__} takes `request`, which belongs to a single test, so"
+                " rows with the same cache_key can't reuse its results."
+            )
+        if self.scope != "function" and "case" in signature(func).parameters:
+            raise CaseConfigurationError(
+                f"{func.__name__} is {self.scope}-scoped, so it can't take `case`."
+                " Have it return or yield a function of the case instead."
+            )
         _registry[self.fixture_name] = CaseTypeInfo(
             type=self.case_type,
             fixture_name=func.__name__,
             skip_validation=self.skip_validation,
+            ids=self.ids,
+        )
+        register_runner(func)
+        runner_params = [*signature(func).parameters]
+        cache = (
+            ResultCache(self.cache_key, self.cache_size)
+            if self.cache_key is not None
+            else None
+        )
+        batch = (
+            Batch(func, self.fixture_name, self.concurrency, self.executor)
+            if self.concurrency > 1
+            else None
         )
+        # batched rows share the dependencies of the test that starts them, so
+        # those come from a module-scoped fixture: pytest refuses narrower ones
+        shared = (
+            _add_fixture(func, "dependencies", _collect_dependencies(runner_params))
+            if batch is not None and [*_dependencies(runner_params)]
+            else None
+        )
+        # scoped setups are fixtures of their own scope, which `fix` depends on
+        setup = (
+            _add_fixture(
+                func,
+                "setup",
+                _scoped_setup(runners.ScopedRunner(func, self.scope), runner_params),
+                scope=self.scope,
+            )
+            if self.scope != "function"
+            else None
+        )
+        # rows only reuse results run with the same fixtures. scoped runners took
+        # theirs in their setup, so it stands for them
+        keyed_by = [setup] if setup else [*_dependencies(runner_params)]
 
-        @pytest.fixture
         def fix(
             case: CaseType,
             request: pytest.FixtureRequest,
+            **dependencies: Any,
         ) -> Iterator[CaseArtifact[CaseType]]:
             """The _real_ fixture that calls the decorated 'virtual' one.
 
-            Uses the FixtureRequest to find values for fixtures based on the virtual
-            fixture's parameter names."""
-            sig = signature(func)
-            kwargs = {name: request.getfixturevalue(name) for name in sig.parameters}
+            Declares the virtual fixture's parameters as its own, so pytest resolves
+            them like for any other fixture and passes them in as `dependencies`."""
+            given = {"case": case, "request": request, **dependencies}
+            if shared is not None:
+                given.update(given.pop(shared))
+            # scoped runners already got theirs, in their setup
+            kwargs = {} if setup else {name: given[name] for name in runner_params}
             artifact = CaseArtifact(case=case)
-            run_result = func(**kwargs)
-            try:
-                # fixtures with cleanup yield once
-                test_result = next(run_result)
-            except TypeError:
-                test_result = run_result
+            key = (
+                cache.key(case, [given[name] for name in keyed_by])
+                if cache is not None
+                else None
+            )
+            cached = cache.get(key) if cache is not None else MISSING
+            if cached is not MISSING:
+                # a row with the same inputs already ran
+                test_result, finish = cached, runners.nothing_to_finish
+            elif setup is not None:
+                test_result = runners.ScopedRunner.run(given[setup], case)
+                finish = runners.nothing_to_finish
+            elif batch is not None and not hasattr(request.config, "workerinput"):
+                # xdist workers only run some rows, so they stick to one at a time
+                test_result, finish = batch.start(request, kwargs)
+            else:
+                test_result, finish = runners.start(func(**kwargs))
+            if cache is not None and cached is MISSING:
+                cache.put(key, test_result)
 
             artifact.actual_result = test_result
             yield artifact
 
-            try:
-                # trigger the cleanup of the runner, if needed
-                next(run_result, ...)
-            except TypeError:
-                pass
+            # trigger the cleanup of the runner, if needed
+            finish()
 
-        return fix
+        fix.__signature__ = _fixture_signature(  # type: ignore
+            [shared] if shared is not None else [setup] if setup else runner_params
+        )
+        return pytest.fixture(fix)
 
     def generator(
         self, func: Callable[CodeGenFuncArgs, CodeGenFuncReturn]
@@ -137,5 +272,82 @@ class Embrace(Generic[CaseType]):
         return render
 
 
+def _fixture_signature(runner_params: list[str]) -> Signature:
+    """`case` and `request`, then whatever else the runner asks for."""
+    names = ["case", "request"]
+    names += [name for name in runner_params if name not in names]
+    return Signature(
+        [Parameter(name, Parameter.POSITIONAL_OR_KEYWORD) for name in names]
+    )
+
+
+def _dependencies(runner_params: list[str]) -> Iterator[str]:
+    return (name for name in runner_params if name not in ("case", "request"))
+
+
+def _taking(names: Iterable[str], func: Callable[..., Any]) -> Callable[..., Any]:
+    """Have pytest pass `func` the fixtures with these names, as keywords."""
+    func.__signature__ = Signature(  # type: ignore
+        [Parameter(name, Parameter.KEYWORD_ONLY) for name in names]
+    )
+    return func
+
+
+def _collect_dependencies(runner_params: list[str]) -> Callable[..., Any]:
+    def collect(**dependencies: Any) -> dict[str, Any]:
+        return dependencies
+
+    return _taking(_dependencies(runner_params), collect)
+
+
+def _scoped_setup(
+    scoped: runners.ScopedRunner, runner_params: list[str]
+) -> Callable[..., Any]:
+    def setup(**dependencies: Any) -> Iterator[Callable[[Any], Any]]:
+        yield from scoped.setup(dependencies)
+
+    return _taking(runner_params, setup)
+
+
+def _add_fixture(
+    runner: Callable[..., Any],
+    part: str,
+    func: Callable[..., Any],
+    scope: str = "module",
+) -> str:
+    """Make `func` a fixture next to the runner, where pytest finds it along with
+    the runner's own fixture. Returns its name."""
+    name = f"_embrace_{runner.__name__}_{part}"
+    module = sys.modules.get(runner.__module__)
+    if module is None:
+        raise CaseConfigurationError(
+            f"{runner.__name__} must be defined in an importable module,"
+            f" not '{runner.__module__}'."
+        )
+    setattr(module, name, pytest.fixture(func, scope=scope, name=name))  # type: ignore
+    return name
+
+
+def _check_cache_key(
+    case_type: type, cache_key: CacheKey, cache_size: int, concurrency: int
+) -> None:
+    if cache_size < 1:
+        raise CaseConfigurationError(f"cache_size must be at least 1, got {cache_size}")
+    if concurrency > 1:
+        raise CaseConfigurationError(
+            "cache_key can't be combined with concurrency: rows run ahead of time"
+            " can't reuse each other's results."
+        )
+    if callable(cache_key):
+        return
+    known = {f.name for f in fields(case_type)}
+    unknown = [name for name in cache_key if name not in known]
+    if isinstance(cache_key, str) or unknown:
+        raise CaseConfigurationError(
+            f"cache_key must name attributes of {case_type.__name__},"
+            f" got {cache_key!r}"
+        )
+
+
 def registry() -> CaseTypeRegistry[CaseTypeInfo]:
     return _registry
@@ -0,0 +1,135 @@
+"""Check simple cases with generated `type(...) is ...` chains, skipping pydantic.
+
+Each case type whose attributes are all `str`, `bytes`, `int`, `float`, `bool`,
+`Any`, or `Optional`/`Union`/`List`/`Dict` of those gets a compiled checking
+function. Passing it means pydantic would accept the case too: exact types are
+required, so `True` is no `int` and `1` is no `float`, as with the strict types of
+`PYDANTIC_STRICTIFICATION_MAP`. Failing it proves nothing, so those cases (and
+every case of a type with other attributes) are left to pydantic, which says
+what's wrong with them."""
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from typing_extensions import Annotated, get_args, get_origin, get_type_hints
+
+Checker = Callable[[Any], bool]
+
+SIMPLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def _unwrap(hint: Any) -> Any:
+    """Annotated[X, "some doc"] is just an X. Other extras may constrain it, so
+    those hints are kept whole (and aren't simple)."""
+    if get_origin(hint) is Annotated and all(
+        isinstance(extra, str) for extra in hint.__metadata__
+    ):
+        return get_args(hint)[0]
+    return hint
+
+
+def _exact_types(hint: Any) -> Optional[List[str]]:
+    """The names of the types a value of `hint` may exactly be, if it's a simple
+    type or a Union of them."""
+    hint = _unwrap(hint)
+    if hint in SIMPLE_TYPES:
+        return [hint.__name__]
+    if get_origin(hint) is Union:
+        names = [_exact_types(arg) for arg in get_args(hint)]
+        if any(option is None for option in names):
+            return None
+        return [name for option in names for name in option or ()]
+    return None
+
+
+def _has_types(value: str, names: List[str]) -> str:
+    if len(names) == 1:
+        return f"type({value}) is {names[0]}"
+    return f"type({value}) in ({', '.join(names)})"
+
+
+def _all_have_types(values: str, names: List[str]) -> str:
+    """Checks the types of a whole collection at once. Much faster than all()."""
+    return f"{{*map(type, {values})}} <= {{{', '.join(names)}}}"
+
+
+def _expression(hint: Any, value: str, depth: int = 0) -> Optional[str]:
+    """Python source that's True when `value` surely is a `hint`, or None if
+    `hint` isn't simple enough."""
+    hint = _unwrap(hint)
+    names = _exact_types(hint)
+    if names is not None:
+        return _has_types(value, names)
+    origin, args = get_origin(hint), get_args(hint)
+    item = f"_{depth}"
+    if hint is Any:
+        return "True"
+    if origin is Union:
+        options = [_expression(arg, value, depth) for arg in args]
+        if None in options:
+            return None
+        return "(" + " or ".join(f"({option})" for option in options) + ")"
+    if hint is list or hint is List:
+        return f"type({value}) is list"
+    if hint is dict or hint is Dict:
+        return f"type({value}) is dict"
+    if origin is list and len(args) == 1:
+        names = _exact_types(args[0])
+        if names is not None:
+            return f"(type({value}) is list and {_all_have_types(value, names)})"
+        inner = _expression(args[0], item, depth + 1)
+        if inner is None:
+            return None
+        return f"(type({value}) is list and all({inner} for {item} in {value}))"
+    if origin is dict and len(args) == 2:
+        keys, values = _exact_types(args[0]), _exact_types(args[1])
+        if keys is not None and values is not None:
+            return (
+                f"(type({value}) is dict and {_all_have_types(value, keys)}"
+                f" and {_all_have_types(f'{value}.values()', values)})"
+            )
+        key = _expression(args[0], f"{item}k", depth + 1)
+        val = _expression(args[1], f"{item}v", depth + 1)
+        if key is None or val is None:
+            return None
+        return (
+            f"(type({value}) is dict and all({key} and {val}"
+            f" for {item}k, {item}v in {value}.items()))"
+        )
+    return None
+
+
+def compile_source(case_type: type) -> Optional[str]:
+    """The source of a checker for a case type, or None if it can't have one."""
+    if not is_dataclass(case_type):
+        return None
+    try:
+        hints = get_type_hints(case_type, include_extras=True)
+    except Exception:  # unresolvable annotations. pydantic will complain
+        return None
+
+    lines = ["def check(case):"]
+    for field in fields(case_type):
+        expression = _expression(hints.get(field.name), "v")
+        if expression is None:
+            return None
+        lines += [f"    v = case.{field.name}", f"    if not {expression}:"]
+        lines.append("        return False")
+    lines.append("    return True")
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def checker(case_type: type) -> Optional[Checker]:
+    """The compiled checker for a case type, or None if it can't have one."""
+    source = compile_source(case_type)
+    if source is None:
+        return None
+    namespace: Dict[str, Any] = {"NoneType": type(None)}
+    exec(
+        compile(source, f"<embrace check {case_type.__qualname__}>", "exec"), namespace
+    )
+    check: Checker = namespace["check"]
+    return check
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import re
+import reprlib
+from dataclasses import fields, is_dataclass
+from functools import partial
+from hashlib import blake2b
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Callable, Optional, Sequence, Union
+
+from .exc import CaseConfigurationError
+
+# turns (row index, case) into a test id
+IdMaker = Callable[[int, Any], str]
+# what users may pass as Embrace(ids=...)
+IdStrategy = Union[str, Sequence[str], Callable[[Any], str]]
+
+DEFAULT_TRUNCATE_LENGTH = 64
+ID_STRATEGIES = ("repr", "index", "hash", "truncate[:<length>]", "fields:<a>,<b>...")
+
+# default reprs (and many others) show where an object happens to be in memory
+_ADDRESS = re.compile(r"\bat 0x[0-9a-fA-F]+")
+
+_short_repr = reprlib.Repr()
+_short_repr.maxstring = 24
+_short_repr.maxother = 24
+
+
+def _by_index(index: int, case: Any) -> str:
+    return str(index)
+
+
+def _full_repr(index: int, case: Any) -> str:
+    return str(case)
+
+
+def _hashed(index: int, case: Any) -> str:
+    try:
+        return case_digest(case)
+    except UnstableDigestError as e:
+        raise UnstableDigestError(f"No 'hash' test id for row {index}: {e}") from e
+
+
+def _short_value(value: Any) -> str:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return _short_repr.repr(value).strip("'\"")
+    return _short_repr.repr(value)
+
+
+def _truncated(length: int) -> IdMaker:
+    def make_id(index: int, case: Any) -> str:
+        # reprlib keeps each attr's repr bounded, unlike the dataclass __repr__
+        attrs = ", ".join(
+            f"{f.name}={_short_repr.repr(getattr(case, f.name))}"
+            for f in fields(case)
+            if f.repr
+        )
+        text = f"{type(case).__name__}({attrs})"
+        return text if len(text) <= length else f"{text[:length - 3]}..."
+
+    return make_id
+
+
+def _from_fields(names: Sequence[str], case_type: Optional[type]) -> IdMaker:
+    if case_type is not None and is_dataclass(case_type):
+        known = {f.name for f in fields(case_type)}
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise CaseConfigurationError(
+                f"Test ids must name attributes of {case_type.__name__},"
+                f" got {', '.join(map(repr, unknown))}"
+            )
+
+    def make_id(index: int, case: Any) -> str:
+        return "-".join(f"{name}={_short_value(getattr(case, name))}" for name in names)
+
+    return make_id
+
+
+def _from_callable(func: Callable[[Any], str]) -> IdMaker:
+    def make_id(index: int, case: Any) -> str:
+        return str(func(case))
+
+    return make_id
+
+
+def id_maker(strategy: IdStrategy, case_type: Optional[type] = None) -> IdMaker:
+    """Turn a test id strategy into a function of (row index, case). Fields it
+    names are checked against `case_type`, when there is one."""
+    if callable(strategy):
+        return _from_callable(strategy)
+    if not isinstance(strategy, str):
+        return _from_fields([*strategy], case_type)
+
+    kind, _, arg = strategy.partition(":")
+    if kind == "repr" and arg == "":
+        return _full_repr
+    if kind == "index" and arg == "":
+        return _by_index
+    if kind == "hash" and arg == "":
+        return _hashed
+    if kind == "truncate":
+        try:
+            return _truncated(int(arg) if arg else DEFAULT_TRUNCATE_LENGTH)
+        except ValueError:
+            pass
+    if kind == "fields" and arg != "":
+        return _from_fields([name.strip() for name in arg.split(",")], case_type)
+
+    raise CaseConfigurationError(
+        f"Invalid test id strategy '{strategy}'. Use one of {ID_STRATEGIES}."
+    )
+
+
+class UnstableDigestError(CaseConfigurationError):
+    """Raised when a value's digest would differ from one process to the next."""
+
+
+def _feed(h: Any, value: Any, stable: bool) -> None:
+    """Feed a value's content into a hash, without building its repr."""
+    h.update(type(value).__qualname__.encode())
+    if value is None or isinstance(value, (bool, int, float, complex)):
+        h.update(repr(value).encode())
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8", "surrogatepass")
+        h.update(f"{len(encoded)}:".encode())
+        h.update(encoded)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        h.update(f"{len(value)}:".encode())
+        h.update(value)
+    elif isinstance(value, (type, FunctionType, BuiltinFunctionType)):
+        # by name, since their reprs hold memory addresses
+        h.update(f"{getattr(value, '__module__', None)}:{value.__qualname__}".encode())
+    elif isinstance(value, ModuleType):
+        h.update(value.__name__.encode())
+    elif isinstance(value, MethodType):
+        _feed(h, value.__self__, stable)
+        _feed(h, value.__func__, stable)
+    elif isinstance(value, partial):
+        _feed(h, (value.func, value.args, value.keywords), stable)
+    elif is_dataclass(value):
+        for f in fields(value):
+            h.update(f.name.encode())
+            _feed(h, getattr(value, f.name), stable)
+    elif isinstance(value, dict):
+        # digest items separately so insertion order doesn't matter
+        for item in sorted(_digest(item, stable) for item in value.items()):
+            h.update(item.encode())
+    elif isinstance(value, (set, frozenset)):
+        for item in sorted(_digest(item, stable) for item in value):
+            h.update(item.encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(str(len(value)).encode())
+        for item in value:
+            _feed(h, item, stable)
+    elif callable(getattr(value, "tobytes", None)):  # arrays & friends
+        h.update(value.tobytes())
+    else:
+        text = repr(value)
+        if stable and _ADDRESS.search(text):
+            raise UnstableDigestError(
+                f"{text} has no stable hash, since its repr() is its memory address."
+                f" Give {type(value).__qualname__} a __repr__ of its contents,"
+                " or make it a dataclass."
+            )
+        h.update(text.encode())
+    h.update(b";")
+
+
+def _digest(value: Any, stable: bool) -> str:
+    h = blake2b(digest_size=8)
+    _feed(h, value, stable)
+    return h.hexdigest()
+
+
+def case_digest(value: Any, *, stable: bool = True) -> str:
+    """A short hash of a case's contents, the same in every process.
+    Raises UnstableDigestError for contents that can't be hashed like that, unless
+    `stable` is False: then the hash is only good for the current process."""
+    return _digest(value, stable)
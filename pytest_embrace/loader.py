@@ -1,19 +1,70 @@
 from __future__ import annotations
 
-from dataclasses import MISSING, asdict, fields, is_dataclass
+from copy import copy, deepcopy
+from dataclasses import fields, is_dataclass
+from itertools import islice
 from types import ModuleType
-from typing import Any, Dict, Generic, List, Mapping, Optional, Tuple, Union
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import pydantic
 import pytest
-from pydantic import ConfigError, create_model
-from pydantic.error_wrappers import ValidationError
-from pydantic.types import StrictBool, StrictBytes, StrictFloat, StrictInt, StrictStr
 
-from pytest_embrace.case import CaseTypeInfo
+try:  # pydantic v2 (and late v1 releases) keep the v1 API here
+    from pydantic.v1 import BaseModel, create_model
+    from pydantic.v1.error_wrappers import ValidationError
+    from pydantic.v1.errors import ConfigError
+    from pydantic.v1.types import (
+        StrictBool,
+        StrictBytes,
+        StrictFloat,
+        StrictInt,
+        StrictStr,
+    )
+except ImportError:  # pragma: no cover
+    from pydantic import BaseModel, ConfigError, create_model
+    from pydantic.error_wrappers import ValidationError
+    from pydantic.types import (
+        StrictBool,
+        StrictBytes,
+        StrictFloat,
+        StrictInt,
+        StrictStr,
+    )
+
+from pytest_embrace.case import CaseTypeInfo, FieldPlan
 
-from .anno import get_pep_593_values
 from .case import CaseType, Trickle
 from .exc import CaseConfigurationError, EmbraceError
+from .fastcheck import checker
+from .profile import SpanTimer, no_span
+
+if TYPE_CHECKING:
+    from .sampling import Sample
+    from .sharding import Shard
+    from .verdicts import VerdictCache
+
+T = TypeVar("T")
+UNSET = object()
+PYDANTIC_V2 = int(pydantic.VERSION.split(".")[0]) >= 2
+
+if PYDANTIC_V2:
+    from . import pydantic_v2
 
 ShouldBecomeStrictBuiltinTypes = Union[str, bytes, int, float, bool]
 StrictPydanticTypes = Union[StrictStr, StrictBytes, StrictInt, StrictFloat, StrictBool]
@@ -38,33 +89,39 @@ class ModuleInfo(Generic[CaseType]):
         self.case = case_type_info
         self.module = module
         self.name = module.__name__
-        self.cls_fields = {field.name: field for field in fields(self.case.type)}
+        self.plan = self.case.plan
+        self.cls_fields = self.plan.fields
         self.filename_values = {
             k: derive.get_attr_value(module.__name__)
-            for k, v in self.cls_fields.items()
-            if (derive := v.metadata.get("derive_from_filename")) is not None
+            for k, derive in self.plan.filename_derivers.items()
         }
         self.module_attrs = {
             attr: getattr(module, attr)
-            for attr in dir(module)
-            if not attr.startswith("__") and attr in self.cls_fields
+            for attr in self.plan.names
+            if not attr.startswith("__") and hasattr(module, attr)
         }
         self.module_attrs.update(self.filename_values)
 
         self.table = getattr(module, "table", None)
-        self.has_table_of_tests = (
+        self.table_is_lazy = _is_lazy_table(self.table)
+        self.has_table_of_tests = self.table_is_lazy or (
             isinstance(self.table, list)
             and len(self.table) > 0
             # would love to use an isinstance() here, but somehow
             # (in Pytester tests specifically)
             # it managed to not work? despite extensive time in PDB?
-            and all(str(type(x)) == str(self.case.type) for x in self.table)
+            and all(self._is_case(x) for x in self.table)
         )
 
-        self.pep_539 = get_pep_593_values(self.case.type)
+        self.pep_539 = self.plan.annotations
 
-        if self.has_table_of_tests:
-            self._trickle_down_table()
+        self._trickle_defaults: Dict[str, Tuple[Any, Trickle]] = {
+            k: (self.module_attrs.get(k, UNSET), trickle)
+            for k, trickle in self.plan.trickles.items()
+        }
+        self._all_trickles_unset = len(self._trickle_defaults) and all(
+            v is UNSET for v, _ in self._trickle_defaults.values()
+        )
 
     def __str__(self) -> str:
         return f"Module[{self.name}]"
@@ -73,6 +130,30 @@ class ModuleInfo(Generic[CaseType]):
     def skip_validation(self) -> bool:
         return self.case.skip_validation
 
+    def detach_module_state(self) -> bool:
+        """Give the module fresh copies of the attributes its cases were built from,
+        so that later mutations of the module (say, by another test module
+        importing from it) can't reach the loaded cases, and the other way around.
+        Loaded cases can be the module's rows, or copies that share their values,
+        so `table` gets copies of every row. Returns False when some attribute
+        can't be copied."""
+        names = [
+            name
+            for name in self.module_attrs
+            if name not in self.filename_values and hasattr(self.module, name)
+        ]
+        if isinstance(self.table, list):
+            names.append("table")
+        try:
+            # at once, so rows still share whatever they shared with the module
+            fresh = deepcopy({name: getattr(self.module, name) for name in names})
+        except Exception:
+            return False
+
+        for name, value in fresh.items():
+            setattr(self.module, name, value)
+        return True
+
     def to_case(self) -> CaseType:
         kwargs = {k: v for k, v in self.module_attrs.items() if k != "table"}
         try:
@@ -83,53 +164,157 @@ class ModuleInfo(Generic[CaseType]):
                 f"\nOnly got attributes {kwargs}"
             )
 
-    def _trickle_down_table(self) -> None:
+    def _is_case(self, o: object) -> bool:
+        return str(type(o)) == str(self.case.type)
+
+    def rows(self) -> Iterator[Tuple[int, CaseType]]:
+        """Yield each (index, case) of `table` with module attributes trickled down.
+        Lazy tables are consumed here one row at a time, and never materialised."""
         assert self.table is not None
-        UNSET = object()
-        trickle_defaults: Dict[str, Tuple[Any, Trickle]] = {
-            k: (self.module_attrs.get(k, UNSET), trickle)
-            for k, v in self.cls_fields.items()
-            if (trickle := v.metadata.get("trickle")) is not None
-        }
-        all_trickles_unset = len(trickle_defaults) and all(
-            v is UNSET for v, _ in trickle_defaults.values()
+        source = (
+            self.table() if self.table_is_lazy and callable(self.table) else self.table
         )
 
-        for i, case in enumerate(self.table):
-            for k, v in asdict(case).items():
-                if k in self.filename_values:
-                    setattr(case, k, self.filename_values[k])
-                elif all_trickles_unset and isinstance(v, Trickle):
+        for i, case in enumerate(source):
+            if self.table_is_lazy and not self._is_case(case):
+                raise CaseConfigurationError(
+                    f"table[{i}] of {self} is a {type(case)},"
+                    f" expected a {self.case.type}."
+                )
+            if self.has_table_of_tests:
+                case = self._trickle_down(i, case)
+            yield i, case
+
+    def _trickle_down(self, i: int, case: CaseType) -> CaseType:
+        """Return `case` with the module's trickles absorbed. The row in `table` is
+        left as it was: the first write goes to a copy of it instead, so a module
+        importing this `table` gets to trickle its own values down."""
+        trickle_defaults = self._trickle_defaults
+        row = case
+        # only trickles (and filename-derived attrs, which are trickles too)
+        # ever get touched, so leave the rest of the case alone.
+        for k in self.plan.trickles:
+            v = getattr(row, k)
+            if k in self.filename_values:
+                if case is row:
+                    case = copy(row)
+                setattr(case, k, self.filename_values[k])
+            elif self._all_trickles_unset and isinstance(v, Trickle):
+                raise CaseConfigurationError(
+                    f"'{k}' is unset at the module level and in table[{i}]:{case}."
+                    " '{k}' is marked as 'trickles()' so it must be set somewhere."
+                )
+            elif k in trickle_defaults and isinstance(v, Trickle):
+                # absorb the default trickle value
+                (trickle_value, _) = trickle_defaults[k]
+                if case is row:
+                    case = copy(row)
+                setattr(case, k, trickle_value)
+            elif k in trickle_defaults:
+                # there was a trickle, but it was overridden
+                (_, trickle_config) = trickle_defaults[k]
+                if trickle_config.no_override and k in self.module_attrs:
                     raise CaseConfigurationError(
-                        f"'{k}' is unset at the module level and in table[{i}]:{case}."
-                        " '{k}' is marked as 'trickles()' so it must be set somewhere."
+                        f"Trickle-down attribute '{k}"
+                        f" cannot be overridden in table[{i}]:{case}'"
                     )
-                elif k in trickle_defaults and isinstance(v, Trickle):
-                    # absorb the default trickle value
-                    (trickle_value, _) = trickle_defaults[k]
-                    setattr(case, k, trickle_value)
-                elif k in trickle_defaults:
-                    # there was a trickle, but it was overridden
-                    (_, trickle_config) = trickle_defaults[k]
-                    if trickle_config.no_override and k in self.module_attrs:
-                        raise CaseConfigurationError(
-                            f"Trickle-down attribute '{k}"
-                            f" cannot be overridden in table[{i}]:{case}'"
+        return case
+
+
+def _is_lazy_table(table: Any) -> bool:
+    """Tables can be any iterable of cases, or a function returning one.
+    Lists are the exception: they're checked eagerly, like they always were."""
+    if table is None or isinstance(table, (list, str, bytes, Mapping, type)):
+        return False
+    return callable(table) or isinstance(table, Iterable)
+
+
+# how many rows of a table are held and validated at a time
+VALIDATION_CHUNK_SIZE = 1000
+
+
+def _chunked(rows: Iterator[T], size: int) -> Iterator[List[T]]:
+    while chunk := [*islice(rows, size)]:
+        yield chunk
+
+
+def load(
+    test: ModuleInfo[CaseType], *, verdicts: Optional[VerdictCache] = None
+) -> List[CaseType]:
+    """Build the validated cases for a module."""
+    return [case for _, case in iter_load(test, verdicts=verdicts)]
+
+
+def iter_load(
+    test: ModuleInfo[CaseType],
+    *,
+    verdicts: Optional[VerdictCache] = None,
+    span: SpanTimer = no_span,
+    defer: Optional[Callable[[List[Tuple[int, CaseType]]], None]] = None,
+    sample: Optional[Sample] = None,
+    shard: Optional[Shard] = None,
+) -> Iterator[Tuple[int, CaseType]]:
+    """Yield (row index, case) for each of a module's validated cases.
+
+    Tables are validated in chunks as they stream by. Every invalid row is
+    reported together, once the table is exhausted.
+    Validation is skipped when `verdicts` remembers the module as valid.
+    Given `defer`, chunks of tables are handed to it instead, to be validated
+    (and their verdicts recorded) elsewhere. See offload.py.
+    Given a `shard` or a `sample` (or both: a sample of the shard), only their rows
+    of a table are validated and yielded.
+    Building rows ('trickle') and validating them ('validate') are timed by `span`."""
+    trusted = verdicts is not None and verdicts.is_valid(test)
+    deferred = False
+
+    if test.table is None:
+        with span("trickle"):
+            case = test.to_case()
+        if not trusted:
+            with span("validate"):
+                revalidate_dataclass(
+                    case,
+                    alias=str(test),
+                    skip=test.skip_validation,
+                    case_type_info=test.case,
+                )
+        yield 0, case
+    else:
+        bad_rows: List[RowErrors] = []
+        rows = test.rows()
+        if shard is not None:
+            rows = shard.select(rows, module=test.name)
+        if sample is not None:
+            with span("trickle"):
+                every_row = [*rows]
+            with span("sample"):
+                rows = iter(sample.select(every_row, module=test.name))
+        chunks = _chunked(rows, VALIDATION_CHUNK_SIZE)
+        while True:
+            with span("trickle"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            if not trusted and defer is not None:
+                with span("validate"):
+                    defer(chunk)
+                deferred = True
+            elif not trusted:
+                with span("validate"):
+                    bad_rows.extend(
+                        collect_table_errors(
+                            chunk,
+                            alias=f"{test}.table",
+                            skip=test.skip_validation,
+                            case_type_info=test.case,
                         )
+                    )
+            yield from chunk
+        if bad_rows:
+            _report_table_validation_errors(bad_rows, target_name=f"{test}.table")
 
-
-def load(test: ModuleInfo[CaseType]) -> List[CaseType]:
-    if test.table is not None:
-        return [
-            revalidate_dataclass(
-                case, alias=f"{test}.table[{i}]{case}", skip=test.skip_validation
-            )
-            for i, case in enumerate(test.table)
-        ]
-
-    return [
-        revalidate_dataclass(test.to_case(), alias=str(test), skip=test.skip_validation)
-    ]
+    if verdicts is not None and not deferred:
+        verdicts.record_valid(test)
 
 
 def _raise_non_dataclass(o: object) -> None:
@@ -137,17 +322,62 @@ def _raise_non_dataclass(o: object) -> None:
         raise CaseConfigurationError("Must use a dataclass for case object.")
 
 
-def _report_validation_error(exc: ValidationError, *, target_name: str) -> None:
-    errors = exc.errors()
-    errors_disambiguation = "\n".join(
-        f"    Variable/Arg '{e['loc'][0]}'"
-        f" should be of type {e['type'].lstrip('type_error.')}"
-        for e in errors
+def _describe_error(error: Mapping[str, Any], *, loc: Any) -> str:
+    return (
+        f"    Variable/Arg '{loc}'"
+        f" should be of type {error['type'].lstrip('type_error.')}"
     )
+
+
+def _report_validation_error(exc: ValidationError, *, target_name: str) -> None:
+    try:
+        _report_errors(
+            [_describe_error(e, loc=e["loc"][0]) for e in exc.errors()],
+            target_name=target_name,
+        )
+    except CaseConfigurationError as e:
+        raise e from exc
+
+
+def _report_errors(errors: List[str], *, target_name: str) -> None:
+    errors_disambiguation = "\n".join(errors)
     raise CaseConfigurationError(
         f"{len(errors)} invalid attr values in '{target_name}':\n"
         f"{errors_disambiguation}"
-    ) from exc
+    )
+
+
+class RowErrors(NamedTuple):
+    row: int
+    case: Any
+    errors: List[str]
+
+
+def _row_errors(
+    exc: ValidationError, *, rows: List[Tuple[int, CaseType]]
+) -> List[RowErrors]:
+    by_row: Dict[int, List[str]] = {}
+    for e in exc.errors():
+        # locations look like ('__root__', <position in rows>, <attr name>, ...)
+        _, position, attr, *_ = e["loc"]
+        by_row.setdefault(int(position), []).append(_describe_error(e, loc=attr))
+
+    return [
+        RowErrors(rows[position][0], rows[position][1], lines)
+        for position, lines in sorted(by_row.items())
+    ]
+
+
+def _report_table_validation_errors(
+    bad_rows: List[RowErrors], *, target_name: str
+) -> None:
+    errors_disambiguation = "\n".join(
+        f"  table[{bad.row}]{bad.case}:\n" + "\n".join(bad.errors) for bad in bad_rows
+    )
+    raise CaseConfigurationError(
+        f"{sum(len(bad.errors) for bad in bad_rows)} invalid attr values"
+        f" in {len(bad_rows)} rows of '{target_name}':\n{errors_disambiguation}"
+    )
 
 
 def _report_likely_recursive_model_bug_error(
@@ -172,31 +402,117 @@ class PydanticConfig:
     arbitrary_types_allowed = True
 
 
-def revalidate_dataclass(case: CaseType, *, alias: str, skip: bool) -> CaseType:
-    _raise_non_dataclass(case)
-    kwargs = asdict(case)
-    pep539 = get_pep_593_values(type(case))
+def _build_validator(case_type_info: CaseTypeInfo) -> Type[BaseModel]:
+    plan = case_type_info.plan
+    pep539 = plan.annotations
     validator_kwargs: Dict[str, Tuple[Any, Any]] = {
-        field.name: (
+        name: (
             PYDANTIC_STRICTIFICATION_MAP.get(
-                pep539[field.name].type if field.name in pep539 else field.type,
+                pep539[name].type if name in pep539 else field.type,
                 field.type,
             ),
-            field.default
-            if field.default is not MISSING
+            plan.defaults[name]
+            if name in plan.defaults
             else (
-                field.default_factory() if field.default_factory is not MISSING else ...
+                plan.default_factories[name]()
+                if name in plan.default_factories
+                else ...
             ),
         )
-        for field in fields(case)
+        for name, field in plan.fields.items()
     }
 
-    Validator = create_model(
-        f"{case.__class__.__name__}__CaseValidator",
+    return create_model(
+        f"{case_type_info.type_name}__CaseValidator",
         **validator_kwargs,
         __config__=PydanticConfig,  # type: ignore
     )
 
+
+def case_validator(case_type_info: CaseTypeInfo) -> Type[BaseModel]:
+    """Get the pydantic model for a case type, building it on first use."""
+    if case_type_info.validator is None:
+        case_type_info.validator = _build_validator(case_type_info)
+    return case_type_info.validator
+
+
+def table_validator(case_type_info: CaseTypeInfo) -> Type[BaseModel]:
+    """Get the pydantic model for a whole list of cases, building it on first use."""
+    if case_type_info.table_validator is None:
+        Validator = case_validator(case_type_info)
+        case_type_info.table_validator = create_model(
+            f"{case_type_info.type_name}__TableValidator",
+            __root__=(List[Validator], ...),  # type: ignore
+        )
+    return case_type_info.table_validator
+
+
+def _v2_errors(cases: List[Any]) -> Optional[Dict[int, List[str]]]:
+    """Under pydantic v2, validate the case types directly (see pydantic_v2.py).
+    None means falling back to the v1 API (pydantic.v1) and a parallel model."""
+    if not PYDANTIC_V2:
+        return None
+    return pydantic_v2.errors_by_position(cases)
+
+
+def _validation_input(plan: FieldPlan, case: CaseType) -> Dict[str, Any]:
+    """Read a case's attributes without deep-copying them like asdict() would.
+    Nested dataclasses are still converted, since pydantic would otherwise coerce
+    their attributes in place."""
+    return {name: _without_dataclasses(v) for name, v in plan.values(case).items()}
+
+
+def _without_dataclasses(value: Any) -> Any:
+    """`value` with the dataclasses in it (however deep in lists, tuples, sets,
+    dicts and other dataclasses) converted to dicts, by reading their fields
+    rather than copying them. Containers without any are passed as they are."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _without_dataclasses(getattr(value, f.name)) for f in fields(value)
+        }
+    if isinstance(value, dict):
+        items = {k: _without_dataclasses(v) for k, v in value.items()}
+        changed = any(items[k] is not v for k, v in value.items())
+        return items if changed else value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        converted = [_without_dataclasses(v) for v in value]
+        if all(new is old for new, old in zip(converted, value)):
+            return value
+        # dicts aren't hashable, so sets go to pydantic as lists
+        return tuple(converted) if isinstance(value, tuple) else converted
+    return value
+
+
+def rows_to_validate(rows: List[Tuple[int, T]]) -> List[Tuple[int, T]]:
+    """The rows that fastcheck.py can't vouch for, to be validated by pydantic."""
+    unsure = []
+    for i, case in rows:
+        case_type: type = type(case)
+        check = checker(case_type)
+        if check is None or not check(case):
+            unsure.append((i, case))
+    return unsure
+
+
+def revalidate_dataclass(
+    case: CaseType,
+    *,
+    alias: str,
+    skip: bool,
+    case_type_info: CaseTypeInfo,
+) -> CaseType:
+    _raise_non_dataclass(case)
+    if not rows_to_validate([(0, case)]):
+        return case
+    errors = _v2_errors([case])
+    if errors is not None:
+        if errors:
+            _report_errors(errors[0], target_name=alias)
+        return case
+
+    kwargs = _validation_input(case_type_info.plan, case)
+    Validator = case_validator(case_type_info)
+
     try:
         Validator(**kwargs)
     except ValidationError as validation_error:
@@ -209,6 +525,41 @@ def revalidate_dataclass(case: CaseType, *, alias: str, skip: bool) -> CaseType:
     return case
 
 
+def collect_table_errors(
+    rows: List[Tuple[int, CaseType]],
+    *,
+    alias: str,
+    skip: bool,
+    case_type_info: CaseTypeInfo,
+) -> List[RowErrors]:
+    """Validate (index, case) rows in one pass and return what's wrong with them."""
+    for _, case in rows:
+        _raise_non_dataclass(case)
+    rows = rows_to_validate(rows)
+    if not rows:
+        return []
+    by_position = _v2_errors([case for _, case in rows])
+    if by_position is not None:
+        return [
+            RowErrors(rows[position][0], rows[position][1], lines)
+            for position, lines in sorted(by_position.items())
+        ]
+
+    TableValidator = table_validator(case_type_info)
+    plan = case_type_info.plan
+
+    try:
+        TableValidator(__root__=[_validation_input(plan, case) for _, case in rows])
+    except ValidationError as validation_error:
+        return _row_errors(validation_error, rows=rows)
+    except ConfigError as config_error:
+        _report_likely_recursive_model_bug_error(
+            config_error, target_name=alias, silence=skip
+        )
+
+    return []
+
+
 def find_embrace_requester(
     *, metafunc: pytest.Metafunc, registry: Mapping[str, CaseTypeInfo]
 ) -> Optional[ModuleInfo]:
@@ -0,0 +1,56 @@
+"""Reuse runner results across rows whose runner inputs are the same."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Sequence, Tuple, Union
+
+from .ids import case_digest
+
+# what users may pass as Embrace(cache_key=...)
+CacheKey = Union[Sequence[str], Callable[[Any], Any]]
+
+DEFAULT_CACHE_SIZE = 128
+MISSING = object()
+
+
+class ResultCache:
+    """An LRU mapping of case keys to the results of running them."""
+
+    def __init__(self, key: CacheKey, size: int = DEFAULT_CACHE_SIZE):
+        if callable(key):
+            self._key: Callable[[Any], Any] = key
+        else:
+            names: Tuple[str, ...] = tuple(key)
+            self._key = lambda case: tuple(getattr(case, name) for name in names)
+        self.size = size
+        self.results: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def key(self, case: Any, dependencies: Sequence[Any] = ()) -> Hashable:
+        """The case's key, along with the other fixture values its runner takes:
+        a row only reuses results that were run with the same ones."""
+        key = _hashable(self._key(case))
+        if not dependencies:
+            return key
+        return (key, *map(_hashable, dependencies))
+
+    def get(self, key: Hashable) -> Any:
+        """The cached result for the key, or MISSING."""
+        if key not in self.results:
+            return MISSING
+        self.results.move_to_end(key)
+        return self.results[key]
+
+    def put(self, key: Hashable, result: Any) -> None:
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+
+def _hashable(key: Any) -> Hashable:
+    try:
+        hash(key)
+    except TypeError:
+        # lists, dicts & co. are keyed by their contents
+        return ("digest", case_digest(key, stable=False))
+    return key
@@ -0,0 +1,137 @@
+"""Validate tables on worker processes while collection goes on.
+
+With `--embrace-validate-workers N`, chunks of every table are sent to a pool of
+N processes as they're loaded (after the compiled checks of fastcheck.py, which
+are cheaper than sending rows away). Collection carries on meanwhile, and the
+results are joined once it's done. A module with invalid rows then fails to
+collect with the same error it would have had otherwise, and loses its tests.
+
+Rows that can't be sent (say, cases that don't pickle) are validated here after
+all, when joining."""
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .case import CaseTypeInfo
+from .concurrency import process_pool
+from .exc import CaseConfigurationError
+from .loader import (
+    ModuleInfo,
+    RowErrors,
+    _report_table_validation_errors,
+    collect_table_errors,
+    rows_to_validate,
+)
+from .verdicts import VerdictCache
+
+Rows = List[Tuple[int, Any]]
+# the errors of a row, as sent back from a worker
+RowLines = List[Tuple[int, List[str]]]
+
+
+@lru_cache(maxsize=None)
+def _case_type_info(case_type: type, skip: bool) -> CaseTypeInfo:
+    # one per type and worker, so validators are built once
+    return CaseTypeInfo(case_type, skip_validation=skip)
+
+
+def _validate(payload: bytes, alias: str, skip: bool) -> RowLines:
+    """Runs in a worker process."""
+    rows: Rows = pickle.loads(payload)
+    case_type: type = type(rows[0][1])
+    info = _case_type_info(case_type, skip)
+    bad_rows = collect_table_errors(rows, alias=alias, skip=skip, case_type_info=info)
+    return [(bad.row, bad.errors) for bad in bad_rows]
+
+
+@dataclass
+class _Pending:
+    test: ModuleInfo
+    verdicts: Optional[VerdictCache]
+    # no future for rows that couldn't be sent
+    chunks: List[Tuple[Rows, Optional[Future]]] = field(default_factory=list)
+
+    def _bad_rows(self, rows: Rows, future: Optional[Future]) -> List[RowErrors]:
+        try:
+            if future is not None:
+                cases = dict(rows)
+                return [
+                    RowErrors(row, cases[row], lines) for row, lines in future.result()
+                ]
+        except CaseConfigurationError:
+            raise
+        except Exception:  # say, the worker couldn't import the case type
+            pass
+        # the rows never made it to a worker, so validate them here
+        return collect_table_errors(
+            rows,
+            alias=f"{self.test}.table",
+            skip=self.test.skip_validation,
+            case_type_info=self.test.case,
+        )
+
+    def errors(self) -> Optional[CaseConfigurationError]:
+        try:
+            bad_rows = [
+                bad
+                for rows, future in self.chunks
+                for bad in self._bad_rows(rows, future)
+            ]
+            if bad_rows:
+                _report_table_validation_errors(
+                    bad_rows, target_name=f"{self.test}.table"
+                )
+        except CaseConfigurationError as e:
+            return e
+
+        if self.verdicts is not None:
+            self.verdicts.record_valid(self.test)
+        return None
+
+
+class ValidationPool:
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.pending: List[_Pending] = []
+
+    @contextmanager
+    def deferring(
+        self, test: ModuleInfo, verdicts: Optional[VerdictCache] = None
+    ) -> Iterator[Callable[[Rows], None]]:
+        """What to hand a module's table chunks to, in place of validating them.
+        Only joined if the whole table loads."""
+        pending = _Pending(test, verdicts)
+        alias, skip = f"{test}.table", test.skip_validation
+
+        def defer(chunk: Rows) -> None:
+            rows = rows_to_validate(chunk)
+            if not rows:
+                return
+            try:
+                payload = pickle.dumps(rows)
+            except Exception:
+                pending.chunks.append((rows, None))
+                return
+            pool = process_pool(self.workers)
+            pending.chunks.append((rows, pool.submit(_validate, payload, alias, skip)))
+
+        yield defer
+        self.pending.append(pending)
+
+    def join(self) -> Dict[Tuple[ModuleType, object], CaseConfigurationError]:
+        """Wait for every chunk. Maps (module, fixture name) to what's wrong with
+        the module's table, for the modules with invalid rows."""
+        errors = {}
+        for pending in self.pending:
+            error = pending.errors()
+            if error is not None:
+                key = (pending.test.module, pending.test.case.fixture_name)
+                errors[key] = error
+        self.pending.clear()
+        return errors
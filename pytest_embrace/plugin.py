@@ -1,27 +1,267 @@
 from __future__ import annotations
 
 import traceback
+from contextlib import nullcontext
 from importlib import reload
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
 import pytest
-from pyperclip import copy
-
-from pytest_embrace.codegen import CodeGenManager
 
+from .concurrency import shutdown_process_pools
+from .datafiles import DataModule, is_data_module, read_header
 from .embrace import registry
-from .loader import find_embrace_requester, load
+from .exc import CaseConfigurationError
+from .ids import ID_STRATEGIES, id_maker
+from .loader import ModuleInfo, find_embrace_requester, iter_load
+from .offload import ValidationPool
+from .preload import (
+    PRELOAD_DIR_KEY,
+    Publication,
+    PublishedCase,
+    copied,
+    copies,
+    preload_dir,
+    resolve_case,
+)
+from .profile import COLLECT, Profiler, SpanTimer, no_span
+from .runners import close_event_loop
+from .sampling import Sample
+from .sharding import DURATIONS_KEY, ROW_PROPERTY, DurationRecorder, Shard, row_key
+from .verdicts import VerdictCache
+
+if TYPE_CHECKING:
+    from _pytest.terminal import TerminalReporter
+
+ISOLATION_STRATEGIES = ("snapshot", "reload")
+
+preload_dir_key = pytest.StashKey[Path]()
+profiler_key = pytest.StashKey[Profiler]()
+# (module, fixture name) -> the cases and ids loaded for the module's first test
+LoadedCases = Dict[Tuple[ModuleType, object], Tuple[List[Any], List[str]]]
+loaded_key = pytest.StashKey[LoadedCases]()
+validation_pool_key = pytest.StashKey[ValidationPool]()
+sample_key = pytest.StashKey[Sample]()
+shard_key = pytest.StashKey[Shard]()
+# module -> node id, for the modules whose tables went to the validation pool
+offloaded_key = pytest.StashKey[Dict[ModuleType, str]]()
 
 
 def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
-    sut = find_embrace_requester(metafunc=metafunc, registry=registry())
+    span = _span_timer(metafunc)
+    with span("module info"):
+        sut = find_embrace_requester(metafunc=metafunc, registry=registry())
     if sut is None:
         return
-    cases = load(sut)
-    metafunc.parametrize("case", cases, ids=[str(c) for c in cases])
-    reload(metafunc.module)  # this guarantees the safety of module scope.
-    # by reloading at the end of a run, any future references to the just-tested module
+
+    loaded = metafunc.config.stash.setdefault(loaded_key, {})
+    key = (metafunc.module, sut.case.fixture_name)
+    if key in loaded:
+        # another test function of the module already loaded (and isolated) it.
+        # that one's tests get the cases themselves, so these get copies
+        cases, ids = loaded[key]
+        loaded[key] = copied(cases, ids), ids
+        with span("parametrize"):
+            _parametrize(metafunc, copies(loaded[key][0]), ids)
+        return
+
+    directory = preload_dir(metafunc.config)
+    publication = Publication(directory, sut) if directory is not None else None
+    if publication is not None and not publication.claim():
+        # another xdist worker is loading this module
+        with span("preload"):
+            published = publication.subscribe()
+        if published is not None:
+            cases, ids = loaded[key] = published
+            with span("parametrize"):
+                _parametrize(metafunc, cases, ids)
+            return  # module values were never touched, so nothing to isolate
+        publication = None
+
+    if validation_pool_key in metafunc.config.stash:
+        offloaded = metafunc.config.stash.setdefault(offloaded_key, {})
+        offloaded[metafunc.module] = metafunc.definition.nodeid.split("::")[0]
+    try:
+        cases, ids = _load_cases(metafunc.config, sut, span)
+    except Exception as e:
+        if publication is not None:
+            publication.publish_error(
+                str(e)
+                if isinstance(e, CaseConfigurationError)
+                else f"{type(e).__name__}: {e}"
+            )
+        raise
+    loaded[key] = cases, ids
+    if publication is not None:
+        with span("preload"):
+            publication.publish(cases, ids)
+
+    with span("parametrize"):
+        metafunc.parametrize("case", cases, ids=ids)
+    # this guarantees the safety of module scope.
+    # once the cases are loaded, any future references to the just-tested module
     # will encounter it in its 'fresh' state.
     # see ../tests/test_plugin/test_safe_mutable_module_scope.py
+    if is_data_module(metafunc.module):
+        return  # nothing can import those, so there's nothing to isolate
+
+    isolation = metafunc.config.getini("embrace_module_isolation")
+    with span("isolation"):
+        if isolation == "reload" or not sut.detach_module_state():
+            reload(metafunc.module)
+
+
+def _parametrize(metafunc: pytest.Metafunc, cases: List[Any], ids: List[str]) -> None:
+    # rows published by another xdist worker go through the `case` fixture, so
+    # each is only unpickled by the test that runs it
+    published = bool(cases) and isinstance(cases[0], PublishedCase)
+    metafunc.parametrize("case", cases, ids=ids, indirect=published)
+
+
+@pytest.fixture
+def case(request: pytest.FixtureRequest) -> Any:
+    """A row published by another xdist worker, unpickled for the test."""
+    return resolve_case(request.param)
+
+
+def _span_timer(metafunc: pytest.Metafunc) -> SpanTimer:
+    profiler = metafunc.config.stash.get(profiler_key, None)
+    if profiler is None:
+        return no_span
+    module = metafunc.definition.getparent(pytest.Module)
+    return profiler.timer(module.nodeid if module is not None else "")
+
+
+def _load_cases(
+    config: pytest.Config, sut: ModuleInfo, span: SpanTimer = no_span
+) -> Tuple[List[Any], List[str]]:
+    sample = config.stash.get(sample_key, None)
+    shard = config.stash.get(shard_key, None)
+    verdicts = (
+        VerdictCache(config.cache)
+        # some of the rows can't vouch for the rest of the table
+        if config.getoption("--embrace-cache")
+        and config.cache is not None
+        and sample is None
+        and shard is None
+        else None
+    )
+    id_strategy = (
+        sut.case.ids if sut.case.ids is not None else config.getini("embrace_ids")
+    )
+    make_id = id_maker(id_strategy, sut.case.type)
+    pool = config.stash.get(validation_pool_key, None)
+    cases, ids = [], []
+    with pool.deferring(sut, verdicts) if pool is not None else nullcontext() as defer:
+        for index, case in iter_load(
+            sut, verdicts=verdicts, span=span, defer=defer, sample=sample, shard=shard
+        ):
+            cases.append(case)
+            ids.append(make_id(index, case))
+    return cases, ids
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    _fail_invalid_modules(config, items)
+    if not config.getoption("--embrace-shard-durations"):
+        return
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        module = getattr(item, "module", None)
+        if callspec is None or module is None or "case" not in callspec.params:
+            continue
+        key = row_key(module.__name__, resolve_case(callspec.params["case"]))
+        if key is not None:  # the others are sharded by index, never by duration
+            # reports carry these along, to xdist's controller too
+            item.user_properties.append((ROW_PROPERTY, key))
+
+
+def _fail_invalid_modules(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """Join the validation pool, and fail the modules with invalid tables like
+    collecting them would have: with a collection error, and without their items.
+    First thing, so other plugins never see those items."""
+    pool = config.stash.get(validation_pool_key, None)
+    if pool is None:
+        return
+    errors = pool.join()
+    broken: Dict[ModuleType, CaseConfigurationError] = {}
+    for (module, _), error in errors.items():
+        broken.setdefault(module, error)
+    if not broken:
+        return
+
+    dropped = [item for item in items if getattr(item, "module", None) in broken]
+    items[:] = [item for item in items if getattr(item, "module", None) not in broken]
+    config.hook.pytest_deselected(items=dropped)
+    offloaded = config.stash[offloaded_key]
+    for module, error in broken.items():
+        report = pytest.CollectReport(offloaded[module], "failed", str(error), [])
+        config.hook.pytest_collectreport(report=report)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    """pytest-xdist hook, run on the controller for each worker it starts."""
+    config: pytest.Config = node.config
+    if preload_dir_key not in config.stash:
+        config.stash[preload_dir_key] = Path(mkdtemp(prefix="pytest-embrace-"))
+    node.workerinput[PRELOAD_DIR_KEY] = str(config.stash[preload_dir_key])
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    trace = config.getoption("--embrace-profile-trace")
+    if profiler_key in config.stash and trace is not None:
+        config.stash[profiler_key].write_chrome_trace(Path(trace))
+    close_event_loop()
+    shutdown_process_pools()
+    if preload_dir_key in config.stash:
+        rmtree(config.stash[preload_dir_key], ignore_errors=True)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector: pytest.Collector) -> Iterator[None]:
+    profiler = collector.config.stash.get(profiler_key, None)
+    if profiler is None or not isinstance(collector, pytest.Module):
+        yield
+        return
+    with profiler.span(COLLECT, collector.nodeid):
+        with profiler.span("import", collector.nodeid):
+            try:
+                collector.obj
+            except Exception:
+                pass  # collecting the module will report this properly
+        yield
+
+
+def pytest_terminal_summary(
+    terminalreporter: TerminalReporter, config: pytest.Config
+) -> None:
+    profiler = config.stash.get(profiler_key, None)
+    if profiler is None or not profiler.spans:
+        return
+    terminalreporter.write_sep("-", "embrace profile")
+    for line in profiler.summary():
+        terminalreporter.write_line(line)
+    trace = config.getoption("--embrace-profile-trace")
+    if trace is not None:
+        terminalreporter.write_line(f"wrote a Chrome trace to {trace}")
+
+
+def pytest_collect_file(
+    file_path: Path, parent: pytest.Collector
+) -> Optional[pytest.Collector]:
+    if not (file_path.name.startswith("test_") or parent.session.isinitpath(file_path)):
+        return None
+    header = read_header(file_path)
+    if header is None:
+        return None
+    return DataModule.from_parent(parent, path=file_path, header=header)
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -42,6 +282,147 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         "--embrace-gen",
         help="Generate code for some fixture:generator",
     )
+    parser.addoption(
+        "--embrace-cache",
+        help=(
+            "Remember which Embrace modules validated cleanly and skip validating"
+            " them again until their source (or their case type's) changes."
+        ),
+        action="store_true",
+    )
+    parser.addoption(
+        "--embrace-profile",
+        help=(
+            "Time each phase of collecting Embrace modules, and summarize the"
+            " slowest modules and phases after the run."
+        ),
+        action="store_true",
+    )
+    parser.addoption(
+        "--embrace-profile-trace",
+        help=(
+            "Also write the --embrace-profile timings to this file, as a Chrome"
+            " trace (for chrome://tracing or https://ui.perfetto.dev)."
+            " Implies --embrace-profile."
+        ),
+        metavar="PATH",
+    )
+    parser.addoption(
+        "--embrace-validate-workers",
+        help=(
+            "Validate the tables of Embrace modules on this many worker processes,"
+            " while collection goes on. Invalid modules then fail to collect once"
+            " it's done. Default: 0, validating as modules are collected."
+        ),
+        type=int,
+        default=0,
+        metavar="N",
+    )
+    parser.addoption(
+        "--embrace-sample",
+        help=(
+            "Only run some rows of each Embrace table: N rows, or P%% of them."
+            " Rows left out aren't validated, and don't become tests."
+        ),
+        metavar="N|P%",
+    )
+    parser.addoption(
+        "--embrace-sample-seed",
+        help="Pick a different (but just as repeatable) --embrace-sample. Default: 0.",
+        type=int,
+        default=0,
+    )
+    parser.addoption(
+        "--embrace-sample-by",
+        help=(
+            "Stratify --embrace-sample by this case attribute, so each of its"
+            " values keeps at least one row."
+        ),
+        metavar="ATTRIBUTE",
+    )
+    parser.addoption(
+        "--embrace-shard",
+        help=(
+            "Only run this shard of the rows of each Embrace table, e.g. 2/4 for"
+            " the second of four. Rows are assigned by a hash of their contents,"
+            " and other shards' rows are never validated."
+        ),
+        metavar="I/N",
+    )
+    parser.addoption(
+        "--embrace-shard-durations",
+        help=(
+            "Without --embrace-shard, record how long the tests of each Embrace row"
+            " take, in the pytest cache. With it, balance shards by those durations."
+        ),
+        action="store_true",
+    )
+    parser.addini(
+        "embrace_module_isolation",
+        help=(
+            "How Embrace test modules are kept from leaking mutations into loaded"
+            " cases. 'snapshot' (default) copies only the case attributes and rows,"
+            " 'reload' re-imports the whole module."
+        ),
+        default="snapshot",
+    )
+    parser.addini(
+        "embrace_ids",
+        help=(
+            "How to name the tests made from Embrace cases, unless Embrace(ids=...)"
+            f" says otherwise. One of {ID_STRATEGIES}. Default: 'repr'."
+        ),
+        default="repr",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("--embrace-profile") or config.getoption(
+        "--embrace-profile-trace"
+    ):
+        config.stash[profiler_key] = Profiler()
+    workers = config.getoption("--embrace-validate-workers")
+    if workers < 0:
+        raise pytest.UsageError(
+            f"--embrace-validate-workers must be at least 0, got {workers}"
+        )
+    sample = config.getoption("--embrace-sample")
+    if sample is not None:
+        try:
+            config.stash[sample_key] = Sample.parse(
+                sample,
+                seed=config.getoption("--embrace-sample-seed"),
+                by=config.getoption("--embrace-sample-by"),
+            )
+        except ValueError as e:
+            raise pytest.UsageError(f"--embrace-sample: {e}") from e
+    durations = config.cache if config.getoption("--embrace-shard-durations") else None
+    shard = config.getoption("--embrace-shard")
+    if durations is not None and shard is None and not hasattr(config, "workerinput"):
+        # a shard's durations would change how the other shards are packed.
+        # under xdist, workers' reports reach the controller, which records them
+        config.pluginmanager.register(DurationRecorder(durations))
+    if shard is not None:
+        try:
+            config.stash[shard_key] = Shard.parse(
+                shard,
+                durations.get(DURATIONS_KEY, {}) if durations is not None else None,
+            )
+        except ValueError as e:
+            raise pytest.UsageError(f"--embrace-shard: {e}") from e
+    if workers and not hasattr(config, "workerinput"):
+        # xdist workers are processes already, each collecting everything
+        config.stash[validation_pool_key] = ValidationPool(workers)
+    isolation = config.getini("embrace_module_isolation")
+    if isolation not in ISOLATION_STRATEGIES:
+        raise pytest.UsageError(
+            f"embrace_module_isolation must be one of {ISOLATION_STRATEGIES},"
+            f" got '{isolation}'"
+        )
+    try:
+        id_maker(config.getini("embrace_ids"))
+    except CaseConfigurationError as e:
+        raise pytest.UsageError(f"embrace_ids: {e}") from e
 
 
 STOP_LOOP = object()  # for pytest hooks that stop on the first-non-None-result
@@ -57,6 +438,11 @@ def pytest_runtestloop(session: pytest.Session) -> object:
     reg = registry()
 
     if codegen_directive is not None:
+        # codegen is imported here so that regular runs don't pay for black & co.
+        from pyperclip import copy
+
+        from .codegen import CodeGenManager
+
         codegen = CodeGenManager(codegen_directive, registry=reg)
         if codegen.case_type is None:
             pytest.exit(
@@ -0,0 +1,222 @@
+"""Load each Embrace module once per pytest-xdist run, instead of once per worker.
+
+The controller hands every worker the same scratch directory. The first worker
+to reach a module claims it, then loads, validates and publishes its cases there:
+the rows are pickled one after another into a single file, with their offsets and
+test ids written alongside. Every other worker parametrizes with lightweight
+`PublishedCase` references, and only unpickles the rows it actually gets to run:
+the plugin's `case` fixture resolves them, so tests only ever see real cases.
+
+The claiming worker holds an flock on the module's lock file until it has
+published. When a waiting worker can take that flock but finds nothing
+published, the claimer died on the way, and the waiting worker loads the module
+itself."""
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import time
+import warnings
+from hashlib import sha256
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from .exc import CaseConfigurationError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # no flocks on Windows: waiting workers rely on the timeout alone there
+    fcntl = None  # type: ignore
+
+if TYPE_CHECKING:
+    from .loader import ModuleInfo
+
+PRELOAD_DIR_KEY = "embrace_preload_dir"
+# how long a worker waits for another to publish a module before giving up
+SUBSCRIBE_TIMEOUT_SECONDS = 600.0
+_POLL_SECONDS = 0.01
+_MAX_POLL_SECONDS = 0.2
+
+
+class PublishedCase:
+    """Stands in for a case loaded by another worker, until a test needs it."""
+
+    def __init__(self, path: str, offset: int, id: str):
+        self.path = path
+        self.offset = offset
+        self.id = id
+
+    def resolve(self) -> Any:
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            return pickle.load(f)
+
+    def __repr__(self) -> str:
+        return f"PublishedCase[{self.id}]"
+
+
+class CopiedCase:
+    """A case that another test function of the module got first, pickled as it
+    was before any test ran, so each later function gets a fresh copy of it."""
+
+    def __init__(self, pickled: bytes, id: str):
+        self.pickled = pickled
+        self.id = id
+
+    def resolve(self) -> Any:
+        return pickle.loads(self.pickled)
+
+    def __repr__(self) -> str:
+        return f"CopiedCase[{self.id}]"
+
+
+def copied(cases: List[Any], ids: List[str]) -> List[Any]:
+    """Pickle cases that are already some other test's, to copy them from. Published
+    cases are copies already, and cases that can't be pickled are shared after all."""
+    out = []
+    for case, id in zip(cases, ids):
+        if not isinstance(case, (PublishedCase, CopiedCase)):
+            try:
+                case = CopiedCase(
+                    pickle.dumps(case, protocol=pickle.HIGHEST_PROTOCOL), id
+                )
+            except Exception:
+                pass
+        out.append(case)
+    return out
+
+
+def copies(cases: List[Any]) -> List[Any]:
+    """Fresh cases, from the `copied` ones."""
+    return [case.resolve() if isinstance(case, CopiedCase) else case for case in cases]
+
+
+def resolve_case(case: Any) -> Any:
+    if isinstance(case, PublishedCase):
+        return case.resolve()
+    return case
+
+
+class Publication:
+    def __init__(self, directory: Path, test: ModuleInfo):
+        key = sha256(f"{test.name}:{test.case.fixture_name}".encode()).hexdigest()
+        self.name = str(test)
+        self.lock = directory / f"{key}.lock"
+        self.rows = directory / f"{key}.pickle"
+        self.meta = directory / f"{key}.json"
+        self._held: Optional[int] = None
+
+    def claim(self) -> bool:
+        """True for exactly one worker: the one that should load the module.
+        It keeps the lock file flocked until it has published."""
+        # flock a private file first, then link it into place, so the lock file
+        # is never there without the flock
+        private = self.lock.with_name(f"{self.lock.name}.{os.getpid()}")
+        fd = os.open(private, os.O_CREAT | os.O_WRONLY)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            os.link(private, self.lock)
+        except FileExistsError:
+            os.close(fd)
+            return False
+        finally:
+            os.unlink(private)
+        self._held = fd
+        return True
+
+    def _release(self) -> None:
+        if self._held is not None:
+            os.close(self._held)  # which drops the flock
+            self._held = None
+
+    def _claimer_gone(self) -> bool:
+        """Whether the claiming worker let go of the lock file, by publishing or
+        by dying."""
+        if fcntl is None:
+            return False
+        with self.lock.open("rb") as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+        return True
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        # write-then-rename, so readers never see half a file
+        tmp = self.meta.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.meta)
+
+    def publish(self, cases: List[Any], ids: List[str]) -> None:
+        try:
+            self._write_meta(self._pickle(cases, ids))
+        finally:
+            self._release()
+
+    def _pickle(self, cases: List[Any], ids: List[str]) -> Dict[str, Any]:
+        offsets: List[int] = []
+        try:
+            with self.rows.open("wb") as f:
+                for case in cases:
+                    offsets.append(f.tell())
+                    pickle.dump(case, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # unpicklable cases: everyone loads for themselves
+            return {"unavailable": True}
+        return {"ids": ids, "offsets": offsets}
+
+    def publish_error(self, message: str) -> None:
+        try:
+            self._write_meta({"error": message})
+        finally:
+            self._release()
+
+    def subscribe(self) -> Optional[Tuple[List[PublishedCase], List[str]]]:
+        """Wait for the published cases. None means load them yourself."""
+        deadline = time.monotonic() + SUBSCRIBE_TIMEOUT_SECONDS
+        poll = _POLL_SECONDS
+        while not self.meta.exists():
+            # the claimer publishes before letting go, so look again
+            if self._claimer_gone() and not self.meta.exists():
+                self._warn_fallback("the worker loading it stopped")
+                return None
+            if time.monotonic() > deadline:
+                self._warn_fallback(
+                    f"it took over {SUBSCRIBE_TIMEOUT_SECONDS:.0f}s to load elsewhere"
+                )
+                return None
+            time.sleep(poll)
+            poll = min(poll * 2, _MAX_POLL_SECONDS)
+
+        meta = json.loads(self.meta.read_text())
+        if "error" in meta:
+            raise CaseConfigurationError(meta["error"])
+        if meta.get("unavailable"):
+            return None
+
+        ids: List[str] = meta["ids"]
+        rows = str(self.rows)
+        return (
+            [
+                PublishedCase(rows, offset, id)
+                for offset, id in zip(meta["offsets"], ids)
+            ],
+            ids,
+        )
+
+    def _warn_fallback(self, reason: str) -> None:
+        warnings.warn(
+            pytest.PytestWarning(f"Loading {self.name} in this worker, as {reason}.")
+        )
+
+
+def preload_dir(config: pytest.Config) -> Optional[Path]:
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None or PRELOAD_DIR_KEY not in workerinput:
+        return None
+    return Path(workerinput[PRELOAD_DIR_KEY])
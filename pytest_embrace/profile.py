@@ -0,0 +1,119 @@
+"""Time the phases of collecting Embrace modules, for `--embrace-profile`."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+# times one phase of loading a module, as in `with span("validate"): ...`
+SpanTimer = Callable[[str], ContextManager[Any]]
+# the span around everything else done to a module
+COLLECT = "collect"
+
+
+def no_span(phase: str) -> ContextManager[Any]:
+    return nullcontext()
+
+
+@dataclass
+class Span:
+    module: str
+    phase: str
+    start: float
+    duration: float
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, phase: str, module: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.spans.append(Span(module, phase, start, duration))
+
+    def timer(self, module: str) -> SpanTimer:
+        return lambda phase: self.span(phase, module)
+
+    def slowest_modules(self) -> List[Tuple[str, float]]:
+        return _totals(
+            (span for span in self.spans if span.phase == COLLECT),
+            key=lambda span: span.module,
+        )
+
+    def slowest_phases(self, module: Optional[str] = None) -> List[Tuple[str, float]]:
+        return _totals(
+            (
+                span
+                for span in self.spans
+                if span.phase != COLLECT and module in (None, span.module)
+            ),
+            key=lambda span: span.phase,
+        )
+
+    def summary(self, limit: int = 10) -> List[str]:
+        lines = [f"slowest {limit} modules:"]
+        for module, total in self.slowest_modules()[:limit]:
+            lines.append(f"  {total:.3f}s {module}")
+            lines.extend(
+                f"      {duration:.3f}s {phase}"
+                for phase, duration in self.slowest_phases(module)
+            )
+        lines.append("phases, over all modules:")
+        lines.extend(
+            f"  {duration:.3f}s {phase}" for phase, duration in self.slowest_phases()
+        )
+        return lines
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The spans as Trace Event Format "complete" events, in microseconds."""
+        pid, tid = os.getpid(), threading.get_ident()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.phase,
+                    "cat": "embrace",
+                    "ph": "X",
+                    "ts": (span.start - self.origin) * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"module": span.module},
+                }
+                for span in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()))
+
+
+def _totals(
+    spans: Iterable[Span], key: Callable[[Span], str]
+) -> List[Tuple[str, float]]:
+    totals: Dict[str, float] = {}
+    for span in spans:
+        totals[key(span)] = totals.get(key(span), 0.0) + span.duration
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
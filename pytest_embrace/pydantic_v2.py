@@ -0,0 +1,70 @@
+"""Validate cases with pydantic v2, straight from their dataclass.
+
+Pydantic v2 validates stdlib dataclasses itself, so there's no parallel model to
+build: a strict `TypeAdapter` for lists of the case type checks whole tables, and
+single cases as lists of one. Nested dataclasses (recursive ones included)
+inherit the adapter's config, since they have none of their own.
+
+Adapters are made per class of the actual cases, as strict mode wants exact
+instances of the adapted class.
+
+Revalidating an instance builds a new one from its attributes, which runs its
+`__post_init__` again. The new instances are thrown away, and the cases tests
+get are the originals."""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from pydantic import TypeAdapter, ValidationError  # type: ignore
+from pydantic.errors import PydanticUserError  # type: ignore
+
+# a pydantic.ConfigDict
+STRICT: Dict[str, Any] = {
+    "strict": True,
+    # check the attributes of the case instances we're given, not just their type
+    "revalidate_instances": "always",
+    "arbitrary_types_allowed": True,
+}
+
+
+@lru_cache(maxsize=None)
+def case_adapter(case_type: type) -> Optional[Any]:
+    """The adapter for lists of a case type, or None if pydantic can't make one
+    (say, for annotations it can't resolve)."""
+    try:
+        return TypeAdapter(List[case_type], config=STRICT)  # type: ignore
+    except PydanticUserError:
+        return None
+
+
+def _describe(error: Mapping[str, Any]) -> str:
+    _, *loc = error["loc"]
+    kind: str = error["type"]
+    expected = (
+        f"should be of type {kind[: -len('_type')]}"
+        if kind.endswith("_type")
+        else error["msg"]
+    )
+    return f"    Variable/Arg '{'.'.join(map(str, loc))}' {expected}"
+
+
+def errors_by_position(cases: Sequence[Any]) -> Optional[Dict[int, List[str]]]:
+    """Validate cases, one pass per case type. Maps the positions of invalid cases
+    to what's wrong with them. None if some case type has no adapter."""
+    by_type: Dict[type, List[int]] = {}
+    for position, case in enumerate(cases):
+        by_type.setdefault(type(case), []).append(position)
+
+    by_position: Dict[int, List[str]] = {}
+    for case_type, positions in by_type.items():
+        adapter = case_adapter(case_type)
+        if adapter is None:
+            return None
+        try:
+            adapter.validate_python([cases[position] for position in positions])
+        except ValidationError as e:
+            for error in e.errors():
+                position = positions[int(error["loc"][0])]
+                by_position.setdefault(position, []).append(_describe(error))
+    return by_position
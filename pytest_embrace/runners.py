@@ -0,0 +1,114 @@
+"""Drive the functions decorated with Embrace.fixture, be they plain functions,
+generators, coroutine functions or async generators."""
+from __future__ import annotations
+
+import asyncio
+from inspect import isasyncgen, isasyncgenfunction, iscoroutine, iscoroutinefunction
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from .exc import CaseConfigurationError
+
+T = TypeVar("T")
+Finish = Callable[[], None]
+SCOPES = ("function", "module", "session")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def event_loop() -> asyncio.AbstractEventLoop:
+    """The loop shared by every async runner in the session, made on first use."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+def close_event_loop() -> None:
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        # rows started ahead of tests that never ran, e.g. after `-x`
+        leftovers = asyncio.all_tasks(_loop)
+        for task in leftovers:
+            task.cancel()
+        if leftovers:
+            _loop.run_until_complete(asyncio.gather(*leftovers, return_exceptions=True))
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+        _loop.close()
+    _loop = None
+
+
+def run_async(awaitable: Awaitable[T]) -> T:
+    return event_loop().run_until_complete(awaitable)
+
+
+def nothing_to_finish() -> None:
+    pass
+
+
+def is_async(func: Callable[..., Any]) -> bool:
+    return iscoroutinefunction(func) or isasyncgenfunction(func)
+
+
+async def start_async(run_result: Any) -> Tuple[Any, Finish]:
+    """`start()` for coroutines and async generators, to await on the shared loop."""
+    if iscoroutine(run_result):
+        return await run_result, nothing_to_finish
+
+    agen = run_result
+    # async runners with cleanup yield once
+    result = await agen.__anext__()
+
+    def finish_async() -> None:
+        try:
+            run_async(agen.__anext__())
+        except StopAsyncIteration:
+            pass
+
+    return result, finish_async
+
+
+def start(run_result: Any) -> Tuple[Any, Finish]:
+    """Take whatever a runner returned and get its actual result, along with
+    a function that runs its cleanup (everything after the `yield`) later."""
+    if iscoroutine(run_result) or isasyncgen(run_result):
+        return run_async(start_async(run_result))
+
+    try:
+        # runners with cleanup yield once
+        result = next(run_result)
+    except TypeError:
+        return run_result, nothing_to_finish
+
+    def finish() -> None:
+        next(run_result, ...)
+
+    return result, finish
+
+
+class ScopedRunner:
+    """Runs a module- or session-scoped runner's setup once per module or session.
+
+    Such runners don't take `case`. They return, or yield once, a function that
+    runs a single case; everything after their `yield` runs once the module
+    (or session) is done. The setup is a pytest fixture of that scope, so pytest
+    tears it down, and refuses dependencies with a narrower scope."""
+
+    def __init__(self, func: Callable[..., Any], scope: str):
+        self.func = func
+        self.scope = scope
+
+    def setup(self, kwargs: Dict[str, Any]) -> Iterator[Callable[[Any], Any]]:
+        """The body of the scoped fixture, yielding the function running each row."""
+        run_case, finish = start(self.func(**kwargs))
+        if not callable(run_case):
+            raise CaseConfigurationError(
+                f"{self.func.__name__} is {self.scope}-scoped, so it must return"
+                f" or yield a function that runs one case, not {run_case!r}."
+            )
+        yield run_case
+        finish()
+
+    @staticmethod
+    def run(run_case: Callable[[Any], Any], case: Any) -> Any:
+        result = run_case(case)
+        return run_async(result) if iscoroutine(result) else result
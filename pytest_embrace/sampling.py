@@ -0,0 +1,104 @@
+"""Pick a deterministic subset of each table's rows, for `--embrace-sample`.
+
+Every row gets a score from a hash of the seed, its module and its index, and a
+sample is the lowest-scoring rows. The same seed always picks the same rows,
+on any machine and in every xdist worker.
+
+Stratified by an attribute, each of its values keeps at least one row, and the
+rest of the sample is shared out in proportion to how many rows each value has."""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple, TypeVar
+
+from .exc import CaseConfigurationError
+from .ids import case_digest
+
+T = TypeVar("T")
+
+_SPEC = re.compile(r"^(\d+(?:\.\d+)?)(%?)$")
+
+
+def _score(seed: int, module: str, index: int) -> bytes:
+    return blake2b(f"{seed}:{module}:{index}".encode(), digest_size=8).digest()
+
+
+def _shares(sizes: List[int], total: int) -> List[int]:
+    """Split `total` rows between strata of these sizes: at least one each, the
+    rest in proportion (by largest remainder), and never more than a stratum has."""
+    whole = sum(sizes)
+    exact = [total * size / whole for size in sizes]
+    shares = [min(size, max(1, math.floor(e))) for size, e in zip(sizes, exact)]
+    by_remainder = sorted(
+        range(len(sizes)), key=lambda i: exact[i] - math.floor(exact[i]), reverse=True
+    )
+    while sum(shares) < total:
+        grown = False
+        for i in by_remainder:
+            if sum(shares) < total and shares[i] < sizes[i]:
+                shares[i] += 1
+                grown = True
+        if not grown:
+            break
+    return shares
+
+
+@dataclass(frozen=True)
+class Sample:
+    """`count` rows per table, or else `percent` of them."""
+
+    count: Optional[int] = None
+    percent: Optional[float] = None
+    seed: int = 0
+    by: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec: str, *, seed: int = 0, by: Optional[str] = None) -> Sample:
+        """From `N` or `P%`."""
+        match = _SPEC.match(spec.strip())
+        if match is None:
+            raise ValueError(f"expected a number of rows or a percentage, got '{spec}'")
+        number, percent = match.groups()
+        if percent:
+            if not 0 < float(number) <= 100:
+                raise ValueError(f"percentage must be in (0, 100], got {number}%")
+            return cls(percent=float(number), seed=seed, by=by)
+        if "." in number or int(number) < 1:
+            raise ValueError(f"number of rows must be a whole number, got {number}")
+        return cls(count=int(number), seed=seed, by=by)
+
+    def size(self, rows: int) -> int:
+        if self.percent is not None:
+            return min(rows, math.ceil(rows * self.percent / 100))
+        assert self.count is not None
+        return min(rows, self.count)
+
+    def select(self, rows: List[Tuple[int, T]], *, module: str) -> List[Tuple[int, T]]:
+        """The sampled (index, case) rows of a module's table, in table order."""
+        if not rows:
+            return rows
+        if self.by is not None and not hasattr(rows[0][1], self.by):
+            raise CaseConfigurationError(
+                f"Can't sample {module} by '{self.by}':"
+                f" {type(rows[0][1]).__name__} has no such attribute."
+            )
+        strata: Dict[str, List[Tuple[int, T]]] = {}
+        for row in rows:
+            key = (
+                ""
+                if self.by is None
+                # only groups the rows, so it needn't be the same in other processes
+                else case_digest(getattr(row[1], self.by), stable=False)
+            )
+            strata.setdefault(key, []).append(row)
+
+        groups = [*strata.values()]
+        shares = _shares([len(group) for group in groups], self.size(len(rows)))
+        picked = []
+        for group, share in zip(groups, shares):
+            group.sort(key=lambda row: _score(self.seed, module, row[0]))
+            picked += group[:share]
+        return sorted(picked, key=lambda row: row[0])
@@ -0,0 +1,111 @@
+"""Split the rows of tables between CI nodes, for `--embrace-shard`.
+
+A row belongs to one of `count` shards, picked by a hash of its module and its
+contents, so every node agrees on it without talking to the others, and rows
+keep their shard when the table around them changes. Rows whose contents have
+no stable hash (see ids.case_digest) go by their index in the table instead.
+
+With `--embrace-shard-durations`, unsharded runs keep how long each row took in
+the pytest cache. Sharded runs then pack the rows with a known duration longest
+first, each into the shard with the least work so far. Every node must see the
+same durations for that, e.g. from the cache of one full run. Sharded runs don't
+record any, so they can't drift apart."""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, TypeVar
+
+import pytest
+
+from .ids import UnstableDigestError, case_digest
+
+T = TypeVar("T")
+
+DURATIONS_KEY = "embrace/durations"
+# names a row in the user_properties of its test reports
+ROW_PROPERTY = "embrace_row"
+
+_SPEC = re.compile(r"^(\d+)/(\d+)$")
+
+
+def row_key(module: str, case: Any) -> Optional[str]:
+    """Names a row by its contents, or None when they have no stable hash."""
+    try:
+        return f"{module}:{case_digest(case)}"
+    except UnstableDigestError:
+        return None
+
+
+def _hashed(key: str, count: int) -> int:
+    digest = blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def pack(durations: Mapping[str, float], count: int) -> Dict[str, int]:
+    """Longest-processing-time-first: each row (by key) goes to the shard with the
+    least total duration so far."""
+    loads = [0.0] * count
+    shards = {}
+    for key, duration in sorted(durations.items(), key=lambda kv: (-kv[1], kv[0])):
+        lightest = min(range(count), key=lambda shard: loads[shard])
+        shards[key] = lightest
+        loads[lightest] += duration
+    return shards
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard `number` (counting from 1) of `count`."""
+
+    number: int
+    count: int
+    # row key -> shard (counting from 0), for the rows packed by duration
+    packed: Mapping[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, spec: str, durations: Optional[Mapping[str, float]] = None) -> Shard:
+        """From `i/n`."""
+        match = _SPEC.match(spec.strip())
+        if match is None:
+            raise ValueError(f"expected <shard>/<shards>, like 1/4, got '{spec}'")
+        number, count = (int(group) for group in match.groups())
+        if not 1 <= number <= count:
+            raise ValueError(f"shard must be between 1 and {count}, got {number}")
+        return cls(number, count, pack(durations, count) if durations else {})
+
+    def owns(self, module: str, index: int, case: Any) -> bool:
+        key = row_key(module, case)
+        if key is None:
+            return _hashed(f"{module}[{index}]", self.count) == self.number - 1
+        shard = self.packed.get(key)
+        if shard is None:
+            shard = _hashed(key, self.count)
+        return shard == self.number - 1
+
+    def select(
+        self, rows: Iterator[Tuple[int, T]], *, module: str
+    ) -> Iterator[Tuple[int, T]]:
+        """This shard's (index, case) rows of a module's table. Streams."""
+        return (row for row in rows if self.owns(module, *row))
+
+
+class DurationRecorder:
+    """A plugin adding up how long each row's tests take, saved to the pytest cache
+    at the end of the session. Under xdist, it reads the reports workers send to
+    the controller, so only the controller writes."""
+
+    def __init__(self, cache: pytest.Cache) -> None:
+        self.cache = cache
+        self.durations: Dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        for name, key in report.user_properties:
+            if name == ROW_PROPERTY and isinstance(key, str):
+                self.durations[key] = self.durations.get(key, 0.0) + report.duration
+
+    def pytest_sessionfinish(self) -> None:
+        if self.durations:
+            recorded = self.cache.get(DURATIONS_KEY, {})
+            self.cache.set(DURATIONS_KEY, {**recorded, **self.durations})
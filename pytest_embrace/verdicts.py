@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from hashlib import sha256
+from inspect import getsourcefile
+from pathlib import Path
+from typing import Optional
+
+import pydantic
+import pytest
+
+from . import __version__
+from .loader import ModuleInfo
+
+CACHE_PREFIX = "embrace/verdicts"
+
+
+def _file_digest(path: Optional[str]) -> Optional[str]:
+    if path is None:
+        return None
+    try:
+        return sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class VerdictCache:
+    """Remember, across runs, which modules loaded valid cases.
+
+    A module is keyed by a hash of its own source together with a hash of the file
+    defining its case type, so editing either invalidates the verdict.
+    Values a module imports from elsewhere are not part of the key."""
+
+    def __init__(self, cache: pytest.Cache):
+        self.cache = cache
+
+    def _key(self, test: ModuleInfo) -> str:
+        return f"{CACHE_PREFIX}/{test.name}:{test.case.type_name}"
+
+    def digest(self, test: ModuleInfo) -> Optional[str]:
+        module_digest = _file_digest(getattr(test.module, "__file__", None))
+        try:
+            case_type_file = getsourcefile(test.case.type)
+        except TypeError:
+            case_type_file = None
+        case_type_digest = _file_digest(case_type_file)
+
+        if module_digest is None or case_type_digest is None:
+            return None
+
+        return sha256(
+            "|".join(
+                (
+                    module_digest,
+                    case_type_digest,
+                    test.case.type.__qualname__,
+                    __version__,
+                    str(pydantic.VERSION),
+                )
+            ).encode()
+        ).hexdigest()
+
+    def is_valid(self, test: ModuleInfo) -> bool:
+        digest = self.digest(test)
+        return digest is not None and self.cache.get(self._key(test), None) == digest
+
+    def record_valid(self, test: ModuleInfo) -> None:
+        digest = self.digest(test)
+        if digest is not None:
+            self.cache.set(self._key(test), digest)
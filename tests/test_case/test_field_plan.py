@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from pytest_embrace.case import (
+    CaseTypeInfo,
+    DeriveFromFileName,
+    FieldPlan,
+    derive_from_filename,
+    trickles,
+)
+
+
+@dataclass
+class PlannedCase:
+    name: str
+    tags: List[str] = field(default_factory=list)
+    count: int = 3
+    beverage: str = trickles(no_override=True)
+    topic: str = derive_from_filename()
+
+
+def test_plan_contents() -> None:
+    plan = FieldPlan.compile(PlannedCase)
+    assert plan.names == ("name", "tags", "count", "beverage", "topic")
+    assert plan.defaults["count"] == 3
+    assert plan.default_factories["tags"]() == []
+    assert [*plan.trickles] == ["beverage", "topic"]
+    assert plan.trickles["beverage"].no_override
+    assert [*plan.filename_derivers] == ["topic"]
+    assert isinstance(plan.filename_derivers["topic"], DeriveFromFileName)
+
+
+def test_plan_is_immutable() -> None:
+    plan = FieldPlan.compile(PlannedCase)
+    with pytest.raises(TypeError):
+        plan.defaults["count"] = 4  # type: ignore
+
+
+def test_case_type_info_compiles_once() -> None:
+    info = CaseTypeInfo(PlannedCase)
+    assert info.type_attrs["count"].dc_field is info.plan.fields["count"]
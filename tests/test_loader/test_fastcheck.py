@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import pytest
+from typing_extensions import Annotated
+
+from pytest_embrace.exc import CaseConfigurationError
+from pytest_embrace.fastcheck import checker
+from pytest_embrace.loader import load
+from tests.conftest import ModuleInfoFactory
+
+
+@dataclass
+class SimpleCase:
+    name: str
+    count: int
+    ratio: float
+    flag: bool
+    raw: bytes
+    note: Optional[str]
+    tags: List[str]
+    weights: Dict[str, float]
+    either: Union[int, str]
+    anything: Any
+
+
+def simple(**kwargs: Any) -> SimpleCase:
+    values: Dict[str, Any] = dict(
+        name="a",
+        count=1,
+        ratio=0.5,
+        flag=True,
+        raw=b"",
+        note=None,
+        tags=["x"],
+        weights={"w": 1.0},
+        either="one",
+        anything=object(),
+    )
+    values.update(kwargs)
+    return SimpleCase(**values)
+
+
+@dataclass
+class DescribedCase:
+    count: Annotated[int, "How many."]
+
+
+@dataclass
+class Inner:
+    x: int
+
+
+@dataclass
+class NestedCase:
+    inner: Inner
+    items: List[int] = field(default_factory=list)
+
+
+def test_simple_case_passes() -> None:
+    check = checker(SimpleCase)
+    assert check is not None
+    assert check(simple())
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"name": 1},
+        {"count": True},
+        {"count": "1"},
+        {"ratio": 1},
+        {"flag": 1},
+        {"note": 3},
+        {"tags": ("x",)},
+        {"tags": ["x", 2]},
+        {"weights": {"w": "heavy"}},
+        {"weights": {1: 1.0}},
+        {"either": 1.5},
+    ],
+)
+def test_wrong_types_fail(kwargs: Dict[str, Any]) -> None:
+    check = checker(SimpleCase)
+    assert check is not None
+    assert not check(simple(**kwargs))
+
+
+def test_described_attributes_are_checked() -> None:
+    check = checker(DescribedCase)
+    assert check is not None
+    assert check(DescribedCase(count=1))
+    assert not check(DescribedCase(count="1"))  # type: ignore
+
+
+def test_nested_dataclasses_are_left_to_pydantic() -> None:
+    assert checker(NestedCase) is None
+
+
+def test_invalid_rows_still_reported_by_pydantic(
+    module_info_factory: ModuleInfoFactory,
+) -> None:
+    target = module_info_factory.build(
+        SimpleCase, table=[simple(), simple(count="1"), simple()]
+    )
+    with pytest.raises(CaseConfigurationError, match=r"table\[1\]"):
+        load(target)
+
+
+def test_valid_table_loads(module_info_factory: ModuleInfoFactory) -> None:
+    table = [simple(count=i) for i in range(3)]
+    target = module_info_factory.build(SimpleCase, table=table)
+    assert load(target) == table
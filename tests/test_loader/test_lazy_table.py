@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator
+
+import pytest
+
+from pytest_embrace import loader, trickles
+from pytest_embrace.exc import CaseConfigurationError
+from pytest_embrace.loader import iter_load, load
+from tests.conftest import ModuleInfoFactory
+
+
+@dataclass
+class LazyCase:
+    number: int
+    label: str = trickles()
+
+
+def test_callable_table(module_info_factory: ModuleInfoFactory) -> None:
+    def table() -> Iterator[LazyCase]:
+        return (LazyCase(number=n) for n in range(3))
+
+    target = module_info_factory.build(LazyCase, label="hi", table=table)
+    assert target.has_table_of_tests
+    assert load(target) == [LazyCase(n, "hi") for n in range(3)]
+
+
+def test_generator_table(module_info_factory: ModuleInfoFactory) -> None:
+    target = module_info_factory.build(
+        LazyCase, label="hi", table=(LazyCase(number=n) for n in range(3))
+    )
+    assert [i for i, _ in iter_load(target)] == [0, 1, 2]
+
+
+def test_rows_are_consumed_incrementally(
+    module_info_factory: ModuleInfoFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(loader, "VALIDATION_CHUNK_SIZE", 2)
+    produced = []
+
+    def table() -> Iterator[LazyCase]:
+        for n in range(10):
+            produced.append(n)
+            yield LazyCase(number=n)
+
+    target = module_info_factory.build(LazyCase, label="hi", table=table)
+    rows = iter_load(target)
+    next(rows)
+    assert produced == [0, 1], "Only the first chunk should have been pulled."
+
+
+def test_wrong_row_type(module_info_factory: ModuleInfoFactory) -> None:
+    target = module_info_factory.build(
+        LazyCase, label="hi", table=lambda: iter([LazyCase(number=1), "oops"])
+    )
+    with pytest.raises(CaseConfigurationError, match=r"table\[1\] of .* is a"):
+        load(target)
+
+
+def test_errors_are_reported_across_chunks(
+    module_info_factory: ModuleInfoFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(loader, "VALIDATION_CHUNK_SIZE", 2)
+    bad = {1, 4}
+    target = module_info_factory.build(
+        LazyCase,
+        label="hi",
+        table=lambda: (
+            LazyCase(number=str(n) if n in bad else n) for n in range(6)  # type: ignore
+        ),
+    )
+    with pytest.raises(CaseConfigurationError) as exc_info:
+        load(target)
+
+    message = str(exc_info.value)
+    assert "2 invalid attr values in 2 rows" in message
+    assert "table[1]" in message and "table[4]" in message
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 import pytest
 
 from pytest_embrace.exc import CaseConfigurationError
-from pytest_embrace.loader import load
+from pytest_embrace.loader import PYDANTIC_V2, load
 from tests.conftest import ModuleInfoFactory
 
 
@@ -14,6 +14,7 @@ class RecursiveCase:
     again: RecursiveCase | None = None
 
 
+@pytest.mark.skipif(PYDANTIC_V2, reason="pydantic v2 validates recursive types")
 def test_error(module_info_factory: ModuleInfoFactory) -> None:
     target = module_info_factory.build(
         RecursiveCase, again=RecursiveCase(), __name__="ouchie"
@@ -30,3 +31,18 @@ def test_silence_error(module_info_factory: ModuleInfoFactory) -> None:
     (loaded,) = load(target)
     expected = RecursiveCase(again=RecursiveCase())
     assert expected == loaded
+
+
+@pytest.mark.skipif(not PYDANTIC_V2, reason="pydantic v1 can't validate these")
+def test_recursive_cases_validate(module_info_factory: ModuleInfoFactory) -> None:
+    target = module_info_factory.build(
+        RecursiveCase, again=RecursiveCase(again=RecursiveCase())
+    )
+    (loaded,) = load(target)
+    assert loaded == RecursiveCase(again=RecursiveCase(again=RecursiveCase()))
+
+    bad = module_info_factory.build(
+        RecursiveCase, again=RecursiveCase(again="nope"), __name__="bad"  # type: ignore
+    )
+    with pytest.raises(CaseConfigurationError, match="'again.again'"):
+        load(bad)
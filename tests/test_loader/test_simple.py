@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, List, Tuple
 
 import pytest
 
@@ -28,3 +29,37 @@ def test_load_fail_on_missing(module_info_factory: ModuleInfoFactory) -> None:
         CaseConfigurationError, match="Only got attributes {'attr1': 'yo'}"
     ):
         load(target)
+
+
+class Uncopyable:
+    def __deepcopy__(self, memo: Any) -> Uncopyable:
+        raise AssertionError("Loading shouldn't copy case attributes.")
+
+
+@dataclass
+class Holder:
+    payload: Any
+
+
+@dataclass
+class PayloadCase:
+    payload: Any
+    items: List[Any]
+    # fastcheck can't vouch for tuples, so rows go to pydantic
+    nested: Tuple[Any, ...] = ()
+
+
+def test_load_does_not_copy_attributes(
+    module_info_factory: ModuleInfoFactory,
+) -> None:
+    payload = Uncopyable()
+    target = module_info_factory.build(
+        PayloadCase,
+        table=[
+            PayloadCase(
+                payload=payload, items=[Uncopyable()], nested=(Holder(Uncopyable()),)
+            )
+        ],
+    )
+    (loaded,) = load(target)
+    assert loaded.payload is payload
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 
 from pytest_embrace.exc import CaseConfigurationError
-from pytest_embrace.loader import load
+from pytest_embrace.loader import PYDANTIC_V2, load
 from tests.conftest import ModuleInfoFactory
 
 
@@ -45,3 +45,94 @@ def test_table_wrong_types(module_info_factory: ModuleInfoFactory) -> None:
     )
     with pytest.raises(CaseConfigurationError):
         load(target)
+
+
+def test_table_reports_every_bad_row(module_info_factory: ModuleInfoFactory) -> None:
+    target = module_info_factory.build(
+        BuiltinsAttrsCase,
+        table=[
+            BuiltinsAttrsCase(string=1, integer=5, dictionary={}),  # type: ignore
+            BuiltinsAttrsCase(string="string", integer=5, dictionary={}),
+            BuiltinsAttrsCase(string=2, integer="5", dictionary={}),  # type: ignore
+        ],
+    )
+    with pytest.raises(CaseConfigurationError) as exc_info:
+        load(target)
+
+    message = str(exc_info.value)
+    assert "3 invalid attr values in 2 rows" in message
+    assert "table[0]" in message
+    assert "table[1]" not in message
+    assert "table[2]" in message
+
+
+@dataclass
+class PostInitCase:
+    string: str
+
+    def __post_init__(self) -> None:
+        self.string = self.string.strip()
+
+
+def test_validation_keeps_the_original_cases(
+    module_info_factory: ModuleInfoFactory,
+) -> None:
+    # pydantic v2 runs __post_init__ again on copies, which are thrown away
+    case = PostInitCase(string=" padded ")
+    case.string = " set later "
+    target = module_info_factory.build(PostInitCase, table=[case])
+    (loaded,) = load(target)
+    assert loaded is case
+    assert loaded.string == " set later "
+
+
+@dataclass
+class FloatCase:
+    value: float
+
+
+@dataclass
+class IntListCase:
+    value: List[int]
+
+
+@dataclass
+class IntTupleCase:
+    value: Tuple[int, ...]
+
+
+@dataclass
+class IntDictCase:
+    value: Dict[str, int]
+
+
+@dataclass
+class OptionalIntCase:
+    value: Optional[int]
+
+
+# where the two pydantic backends disagree (see docs/faq.md), so that any change
+# to either is deliberate
+@pytest.mark.parametrize(
+    "case_type, value, v1_accepts",
+    [
+        (FloatCase, 1, False),
+        (IntListCase, ["1"], True),
+        (IntListCase, (1, 2), True),
+        (IntTupleCase, [1, 2], True),
+        (IntDictCase, {"a": "1"}, True),
+        (OptionalIntCase, "1", True),
+    ],
+)
+def test_pydantic_versions_differ(
+    module_info_factory: ModuleInfoFactory,
+    case_type: type,
+    value: Any,
+    v1_accepts: bool,
+) -> None:
+    target = module_info_factory.build(case_type, value=value)
+    if v1_accepts != PYDANTIC_V2:
+        load(target)
+    else:
+        with pytest.raises(CaseConfigurationError):
+            load(target)
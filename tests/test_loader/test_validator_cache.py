@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from pytest_embrace.loader import case_validator, load
+from tests.conftest import ModuleInfoFactory
+
+
+@dataclass
+class CachedCase:
+    name: str
+    count: int
+
+
+def test_validator_built_once_per_type(
+    module_info_factory: ModuleInfoFactory,
+) -> None:
+    target = module_info_factory.build(
+        CachedCase,
+        table=[CachedCase(name="one", count=1), CachedCase(name="two", count=2)],
+    )
+    validator = case_validator(target.case)
+    load(target)
+    assert case_validator(target.case) is validator
@@ -0,0 +1,78 @@
+"""Runners can be coroutine functions or async generators.
+They all share one event loop."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    import asyncio
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class AsyncCase:
+        name: str
+
+
+    loops = set()
+
+    coro = Embrace(AsyncCase)
+
+
+    @coro.fixture
+    async def coro_case(case: AsyncCase) -> str:
+        await asyncio.sleep(0)
+        loops.add(id(asyncio.get_running_loop()))
+        return case.name.upper()
+
+
+    agen = Embrace(AsyncCase)
+
+
+    @agen.fixture
+    async def agen_case(case: AsyncCase) -> str:
+        loops.add(id(asyncio.get_running_loop()))
+        yield case.name[::-1]
+        await asyncio.sleep(0)
+        print(f"Cleaning up {case.name}")
+    """
+)
+
+
+def test_coroutine_runner(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import AsyncCase, loops
+
+        table = [AsyncCase(name="one"), AsyncCase(name="two")]
+
+
+        def test(coro_case):
+            assert coro_case.actual_result == coro_case.case.name.upper()
+            assert len(loops) == 1
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=2)
+
+
+def test_async_generator_runner(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import AsyncCase, loops
+
+        table = [AsyncCase(name="one"), AsyncCase(name="two")]
+
+
+        def test(agen_case):
+            assert agen_case.actual_result == agen_case.case.name[::-1]
+            assert len(loops) == 1
+        """
+    )
+    outcome = pytester.runpytest("-s")
+    outcome.assert_outcomes(passed=2)
+    outcome.stdout.fnmatch_lines(["*Cleaning up one*", "*Cleaning up two*"])
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from pytest_embrace import loader
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class CachedCase:
+        name: str
+
+
+    embrace = Embrace(CachedCase)
+
+
+    @embrace.fixture
+    def cached_case(case: CachedCase) -> None:
+        pass
+    """
+)
+
+TEST_MODULE = """
+from conftest import CachedCase
+
+table = [CachedCase(name="one"), CachedCase(name="two")]
+
+
+def test(cached_case):
+    ...
+"""
+
+
+def _refuse_to_validate(*args: Any, **kwargs: Any) -> Any:
+    raise AssertionError("Validation should have been skipped.")
+
+
+def test_unchanged_module_skips_validation(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytester.makepyfile(test_cached=TEST_MODULE)
+    pytester.runpytest("--embrace-cache").assert_outcomes(passed=2)
+
+    monkeypatch.setattr(loader, "collect_table_errors", _refuse_to_validate)
+    pytester.runpytest("--embrace-cache").assert_outcomes(passed=2)
+
+
+def test_changed_module_is_validated_again(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytester.makepyfile(test_cached=TEST_MODULE)
+    pytester.runpytest("--embrace-cache").assert_outcomes(passed=2)
+
+    pytester.makepyfile(test_cached=TEST_MODULE.replace('"two"', "2"))
+    outcome = pytester.runpytest("--embrace-cache")
+    outcome.assert_outcomes(errors=1)
+    outcome.stdout.fnmatch_lines("*1 invalid attr values in 1 rows*")
+
+
+def test_cache_is_opt_in(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytester.makepyfile(test_cached=TEST_MODULE)
+    pytester.runpytest("--embrace-cache").assert_outcomes(passed=2)
+
+    monkeypatch.setattr(loader, "collect_table_errors", _refuse_to_validate)
+    pytester.runpytest().assert_outcomes(errors=1)
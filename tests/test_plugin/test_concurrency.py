@@ -0,0 +1,197 @@
+"""Embrace(concurrency=N) runs the runner for many rows of a module at once.
+Each row is still its own test with its own result and cleanup."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    import asyncio
+    import threading
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class RowCase:
+        name: str
+
+
+    # would time out if the three rows ran one at a time
+    barrier = threading.Barrier(3, timeout=5)
+    started = []
+
+    threaded = Embrace(RowCase, concurrency=3)
+
+
+    @threaded.fixture
+    def threaded_case(case: RowCase) -> str:
+        started.append(case.name)
+        if case.name == "bad":
+            raise ValueError("bad row")
+        barrier.wait()
+        yield case.name.upper()
+        print(f"Cleaning up {case.name}")
+
+
+    arrived = []
+
+    gathered = Embrace(RowCase, concurrency=3)
+
+
+    @gathered.fixture
+    async def gathered_case(case: RowCase) -> str:
+        arrived.append(case.name)
+
+        async def everyone() -> None:
+            while len(arrived) < 3:
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(everyone(), timeout=5)
+        return case.name[::-1]
+    """
+)
+
+
+def test_threaded_rows(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import RowCase
+
+        table = [RowCase(name="one"), RowCase(name="two"), RowCase(name="three")]
+
+
+        def test(threaded_case):
+            assert threaded_case.actual_result == threaded_case.case.name.upper()
+        """
+    )
+    outcome = pytester.runpytest("-s")
+    outcome.assert_outcomes(passed=3)
+    outcome.stdout.fnmatch_lines(
+        ["*Cleaning up one*", "*Cleaning up two*", "*Cleaning up three*"]
+    )
+
+
+def test_async_rows(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import RowCase
+
+        table = [RowCase(name="one"), RowCase(name="two"), RowCase(name="three")]
+
+
+        def test(gathered_case):
+            assert gathered_case.actual_result == gathered_case.case.name[::-1]
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=3)
+
+
+def test_failing_row_errors_alone(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import threading
+
+        import conftest
+        from conftest import RowCase
+
+        conftest.barrier = threading.Barrier(2, timeout=5)
+
+        table = [RowCase(name="one"), RowCase(name="bad"), RowCase(name="two")]
+
+
+        def test(threaded_case):
+            assert threaded_case.actual_result == threaded_case.case.name.upper()
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=2, errors=1)
+    outcome.stdout.fnmatch_lines(["*ValueError: bad row*"])
+
+
+def test_only_selected_rows_run(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import threading
+
+        import conftest
+        from conftest import RowCase, started
+
+        conftest.barrier = threading.Barrier(1, timeout=5)
+
+        table = [RowCase(name="one"), RowCase(name="two"), RowCase(name="three")]
+
+
+        def test(threaded_case):
+            assert started == ["two"]
+        """
+    )
+    pytester.runpytest("-k", "two").assert_outcomes(passed=1, deselected=2)
+
+
+DEPENDENT = """
+import pytest
+
+from conftest import RowCase
+from pytest_embrace import Embrace
+
+resources = []
+
+
+@pytest.fixture(scope="{scope}")
+def resource():
+    state = {{"closed": False}}
+    resources.append(state)
+    yield state
+    state["closed"] = True
+
+
+dependent = Embrace(RowCase, concurrency=3)
+
+
+@dependent.fixture
+def dependent_case(case: RowCase, resource) -> bool:
+    return resource["closed"]
+
+
+table = [RowCase(name=str(i)) for i in range(4)]
+
+
+def test(dependent_case):
+    assert dependent_case.actual_result is False
+    assert len(resources) == 1
+"""
+
+
+def test_module_scoped_dependencies_are_shared(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(DEPENDENT.format(scope="module"))
+    pytester.runpytest().assert_outcomes(passed=4)
+
+
+def test_function_scoped_dependencies_refused(pytester: pytest.Pytester) -> None:
+    # they'd be torn down with the first test while the other rows still use them
+    pytester.makepyfile(DEPENDENT.format(scope="function"))
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(errors=4)
+    outcome.stdout.fnmatch_lines(["*ScopeMismatch*function scoped fixture resource*"])
+
+
+def test_request_refused(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import RowCase
+        from pytest_embrace import Embrace
+
+        requesting = Embrace(RowCase, concurrency=3)
+
+
+        @requesting.fixture
+        def requesting_case(case: RowCase, request) -> None:
+            pass
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.stdout.fnmatch_lines(["*can't take `request`*"])
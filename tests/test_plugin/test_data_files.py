@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+    from typing import Optional
+
+    from pytest_embrace import Embrace, trickles
+
+
+    @dataclass
+    class DataCase:
+        word: str
+        times: int
+        separator: str = trickles()
+
+
+    embrace = Embrace(DataCase)
+
+
+    @embrace.fixture
+    def data_case(case: DataCase) -> None:
+        assert case.separator.join([case.word] * case.times) == "hey-hey"
+
+
+    @dataclass
+    class ZipCase:
+        code: str
+        digits: int
+        note: Optional[str] = None
+
+
+    zips = Embrace(ZipCase)
+
+
+    @zips.fixture
+    def zip_case(case: ZipCase) -> None:
+        assert len(case.code) == case.digits
+    """
+)
+
+
+def test_jsonl(pytester: pytest.Pytester) -> None:
+    pytester.makefile(
+        ".jsonl",
+        test_words="""
+            {"embrace": "data_case", "separator": "-"}
+            {"word": "hey", "times": 2}
+            {"word": "hey", "times": 2}
+            {"word": "hey", "times": 3}
+            """,
+    )
+    outcome = pytester.runpytest()
+    # the runner does the asserting, and fixtures that fail are errors
+    outcome.assert_outcomes(passed=2, errors=1)
+
+
+def test_csv(pytester: pytest.Pytester) -> None:
+    pytester.makefile(
+        ".csv",
+        test_words="""
+            # embrace: data_case
+            # separator: -
+            word,times,separator
+            hey,2,
+            hey,2,-
+            """,
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=2)
+
+
+def test_csv_str_columns_stay_text(pytester: pytest.Pytester) -> None:
+    pytester.makefile(
+        ".csv",
+        test_zips="""
+            # embrace: zip_case
+            code,digits,note
+            90210,5,7
+            02134,5,
+            """,
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=2)
+
+
+def test_toml(pytester: pytest.Pytester) -> None:
+    pytester.makefile(
+        ".toml",
+        test_words="""
+            embrace = "data_case"
+            separator = "-"
+
+            [[table]]
+            word = "hey"
+            times = 2
+            """,
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=1)
+
+
+def test_validation_applies(pytester: pytest.Pytester) -> None:
+    pytester.makefile(
+        ".jsonl",
+        test_words="""
+            {"embrace": "data_case", "separator": "-"}
+            {"word": "hey", "times": "2"}
+            """,
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(errors=1)
+    outcome.stdout.fnmatch_lines("*1 invalid attr values in 1 rows*")
+
+
+def test_unknown_fixture(pytester: pytest.Pytester) -> None:
+    pytester.makefile(
+        ".jsonl",
+        test_words="""
+            {"embrace": "nope"}
+            """,
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(errors=1)
+    outcome.stdout.fnmatch_lines("*wants Embrace fixture 'nope'*")
+
+
+def test_other_data_files_are_ignored(pytester: pytest.Pytester) -> None:
+    pytester.makefile(".csv", test_unrelated="a,b\n1,2\n")
+    pytester.makefile(".jsonl", test_unrelated='{"a": 1}\n')
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+import pytest
+
+from pytest_embrace.ids import UnstableDigestError, case_digest, id_maker
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass, field
+    from typing import List
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class IdCase:
+        name: str
+        blob: List[int] = field(default_factory=list)
+
+
+    by_default = Embrace(IdCase)
+
+
+    @by_default.fixture
+    def default_ids(case: IdCase) -> None:
+        pass
+
+
+    by_fields = Embrace(IdCase, ids=("name",))
+
+
+    @by_fields.fixture
+    def field_ids(case: IdCase) -> None:
+        pass
+    """
+)
+
+
+def table_module(fixture: str) -> str:
+    return f"""
+from conftest import IdCase
+
+table = [IdCase(name="one", blob=[*range(1000)]), IdCase(name="two")]
+
+
+def test({fixture}):
+    ...
+"""
+
+
+def collected_ids(outcome: pytest.RunResult) -> List[str]:
+    return [
+        match[1]
+        for line in outcome.stdout.lines
+        if (match := re.search(r"::test\[(.*)\]$", line)) is not None
+    ]
+
+
+def test_default_is_full_repr(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(table_module("default_ids"))
+    ids = collected_ids(pytester.runpytest("--collect-only", "-q"))
+    assert ids[1] == "IdCase(name='two', blob=[])"
+    assert len(ids[0]) > 1000
+
+
+def test_embrace_option(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(table_module("field_ids"))
+    ids = collected_ids(pytester.runpytest("--collect-only", "-q"))
+    assert ids == ["name=one", "name=two"]
+
+
+@pytest.mark.parametrize(
+    "strategy, expected",
+    [
+        ("index", ["0", "1"]),
+        ("fields:name", ["name=one", "name=two"]),
+        ("truncate:27", ["IdCase(name='one', blob=...", "IdCase(name='two', blob=[])"]),
+    ],
+)
+def test_ini_option(
+    pytester: pytest.Pytester, strategy: str, expected: List[str]
+) -> None:
+    pytester.makeini(f"[pytest]\nembrace_ids = {strategy}")
+    pytester.makepyfile(table_module("default_ids"))
+    assert collected_ids(pytester.runpytest("--collect-only", "-q")) == expected
+
+
+def test_hash_ids(pytester: pytest.Pytester) -> None:
+    pytester.makeini("[pytest]\nembrace_ids = hash")
+    pytester.makepyfile(table_module("default_ids"))
+    ids = collected_ids(pytester.runpytest("--collect-only", "-q"))
+    assert [len(id_) for id_ in ids] == [16, 16]
+    assert ids[0] != ids[1]
+
+
+def test_bad_ini_option(pytester: pytest.Pytester) -> None:
+    pytester.makeini("[pytest]\nembrace_ids = nope")
+    outcome = pytester.runpytest()
+    outcome.stderr.fnmatch_lines("*Invalid test id strategy 'nope'*")
+
+
+def test_unknown_fields_refused(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from conftest import IdCase
+        from pytest_embrace import Embrace
+        from pytest_embrace.exc import CaseConfigurationError
+
+
+        def test():
+            with pytest.raises(CaseConfigurationError, match="got 'nope'"):
+                Embrace(IdCase, ids=("name", "nope"))
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
+
+
+def test_unknown_ini_fields_refused(pytester: pytest.Pytester) -> None:
+    pytester.makeini("[pytest]\nembrace_ids = fields:nope")
+    pytester.makepyfile(table_module("default_ids"))
+    outcome = pytester.runpytest()
+    outcome.stdout.fnmatch_lines(["*Test ids must name attributes of IdCase*'nope'*"])
+
+
+@dataclass
+class Nested:
+    mapping: Dict[str, int]
+    items: List[str]
+
+
+def test_digest_is_content_based() -> None:
+    a = Nested(mapping={"x": 1, "y": 2}, items=["ab", "c"])
+    b = Nested(mapping={"y": 2, "x": 1}, items=["ab", "c"])
+    c = Nested(mapping={"x": 1, "y": 2}, items=["a", "bc"])
+    assert case_digest(a) == case_digest(b)
+    assert case_digest(a) != case_digest(c)
+
+
+def test_index_ids_use_row_index() -> None:
+    make_id = id_maker("index")
+    assert [make_id(3, "x"), make_id(7, "y")] == ["3", "7"]
+
+
+# functions, classes & co. have memory addresses in their reprs
+DIGEST_IN_SUBPROCESS = """
+import functools
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from pytest_embrace.ids import case_digest
+
+
+@dataclass
+class HookCase:
+    hook: Any
+    kind: Any
+    bound: Any
+    curried: Any
+    module: Any
+    names: Any
+
+
+case = HookCase(
+    hook=lambda: 1,
+    kind=HookCase,
+    bound=[].append,
+    curried=functools.partial(print, "x", sep=""),
+    module=os,
+    names={"a", "b", "c"},
+)
+print(case_digest(case))
+"""
+
+
+def test_digest_is_the_same_in_every_process() -> None:
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", DIGEST_IN_SUBPROCESS],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(digests) == 1
+
+
+def test_digest_refuses_memory_addresses() -> None:
+    with pytest.raises(UnstableDigestError, match="has no stable hash"):
+        case_digest(Nested(mapping={}, items=[object()]))  # type: ignore
+    assert case_digest(object(), stable=False)
@@ -0,0 +1,38 @@
+"""Plain test runs shouldn't import the code generation stack."""
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Set
+
+import pytest
+
+CODEGEN_ONLY_MODULES = {"black", "isort", "pyperclip", "pytest_embrace.codegen"}
+
+
+def imported_modules(statement: str) -> Set[str]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines look like 'import time:   self [us] | cumulative | <indent>module.name'
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import pytest_embrace.plugin", "from pytest_embrace import Embrace"],
+)
+def test_codegen_not_imported(statement: str) -> None:
+    assert imported_modules(statement) & CODEGEN_ONLY_MODULES == set()
+
+
+def test_lazy_attrs_still_work() -> None:
+    modules = imported_modules("from pytest_embrace import RenderText")
+    assert "pytest_embrace.codegen" in modules
@@ -0,0 +1,67 @@
+"""Validating a case never changes it, however deep its dataclasses are nested."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest, make_test_run_outcome_fixture
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+    from typing import Dict, List, Tuple
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class Point:
+        x: float
+
+
+    @dataclass
+    class PointsCase:
+        point: Point
+        points: List[Point]
+        named: Dict[str, Point]
+        pairs: Tuple[Tuple[Point, int], ...]
+
+
+    embrace = Embrace(PointsCase)
+
+
+    @embrace.fixture
+    def points_case(case: PointsCase) -> None:
+        pass
+    """
+)
+
+outcome = make_test_run_outcome_fixture(
+    test_points="""
+    from conftest import Point, PointsCase
+
+    # pydantic takes ints for floats, but must not write 1.0 back into the points
+    table = [
+        PointsCase(
+            point=Point(1),
+            points=[Point(2)],
+            named={"p": Point(3)},
+            pairs=((Point(4), 0),),
+        )
+    ]
+
+
+    def test(points_case):
+        case = points_case.case
+        xs = [
+            case.point.x,
+            case.points[0].x,
+            case.named["p"].x,
+            case.pairs[0][0].x,
+        ]
+        assert [type(x) for x in xs] == [int] * 4
+    """
+)
+
+
+def test_nested_dataclasses_not_coerced(outcome: pytest.RunResult) -> None:
+    outcome.assert_outcomes(passed=1)
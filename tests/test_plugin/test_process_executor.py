@@ -0,0 +1,102 @@
+"""Embrace(executor="process") runs rows on a pool of worker processes,
+which lasts for the whole session."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    import os
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class CpuCase:
+        n: int
+
+
+    worker_pids = set()
+
+    cpu = Embrace(CpuCase, concurrency=2, executor="process")
+
+
+    @cpu.fixture
+    def cpu_case(case: CpuCase):
+        if case.n < 0:
+            raise ValueError("negative n")
+        yield os.getpid(), sum(range(case.n))
+    """
+)
+
+
+def test_rows_run_in_reused_workers(pytester: pytest.Pytester) -> None:
+    for name in ("test_first", "test_second"):
+        pytester.makepyfile(
+            **{
+                name: """
+                import os
+
+                from conftest import CpuCase, worker_pids
+
+                table = [CpuCase(n=n) for n in (10, 100, 1000)]
+
+
+                def test(cpu_case):
+                    pid, total = cpu_case.actual_result
+                    assert pid != os.getpid()
+                    assert total == sum(range(cpu_case.case.n))
+                    worker_pids.add(pid)
+                    assert len(worker_pids) <= 2
+                """
+            }
+        )
+    pytester.runpytest().assert_outcomes(passed=6)
+
+
+def test_runner_errors_reach_their_row(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import CpuCase
+
+        table = [CpuCase(n=1), CpuCase(n=-1)]
+
+
+        def test(cpu_case):
+            pass
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=1, errors=1)
+    outcome.stdout.fnmatch_lines(["*ValueError: negative n*"])
+
+
+def test_process_runners_only_take_case(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from dataclasses import dataclass
+
+        import pytest
+
+        from pytest_embrace import Embrace
+        from pytest_embrace.exc import CaseConfigurationError
+
+
+        @dataclass
+        class OtherCase:
+            n: int
+
+
+        def test():
+            other = Embrace(OtherCase, concurrency=2, executor="process")
+            with pytest.raises(CaseConfigurationError, match="only take"):
+
+                @other.fixture
+                def other_case(case: OtherCase, tmp_path):
+                    pass
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
@@ -0,0 +1,76 @@
+"""--embrace-profile times the phases of collecting each Embrace module."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class ProfiledCase:
+        n: int
+
+
+    embrace = Embrace(ProfiledCase)
+
+
+    @embrace.fixture
+    def profiled_case(case: ProfiledCase) -> int:
+        return case.n
+    """
+)
+
+
+@pytest.fixture(autouse=True)
+def module(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        test_profiled="""
+        from conftest import ProfiledCase
+
+        table = [ProfiledCase(n=n) for n in range(5)]
+
+
+        def test(profiled_case):
+            pass
+        """
+    )
+
+
+def test_summary(pytester: pytest.Pytester) -> None:
+    outcome = pytester.runpytest("--embrace-profile")
+    outcome.assert_outcomes(passed=5)
+    outcome.stdout.fnmatch_lines(
+        [
+            "*- embrace profile -*",
+            "slowest 10 modules:",
+            "  *s test_profiled.py",
+            "      *s import",
+            "phases, over all modules:",
+        ]
+    )
+    for phase in ("trickle", "validate", "parametrize", "isolation"):
+        outcome.stdout.fnmatch_lines([f"  *s {phase}"])
+
+
+def test_no_summary_by_default(pytester: pytest.Pytester) -> None:
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=5)
+    outcome.stdout.no_fnmatch_line("*embrace profile*")
+
+
+def test_chrome_trace(pytester: pytest.Pytester) -> None:
+    trace = pytester.path / "trace.json"
+    outcome = pytester.runpytest(f"--embrace-profile-trace={trace}")
+    outcome.assert_outcomes(passed=5)
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert {event["name"] for event in events} >= {"collect", "import", "validate"}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert {event["args"]["module"] for event in events} == {"test_profiled.py"}
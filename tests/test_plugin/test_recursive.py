@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import pytest
 
+from pytest_embrace.loader import PYDANTIC_V2
+
 from .utils import make_autouse_conftest, make_test_run_outcome_fixture
 
 _ = make_autouse_conftest(
@@ -50,6 +52,7 @@ avoidable_failure_outcome = make_test_run_outcome_fixture(
 )
 
 
+@pytest.mark.skipif(PYDANTIC_V2, reason="pydantic v2 validates recursive types")
 def test_get_warned(avoidable_failure_outcome: pytest.RunResult) -> None:
     avoidable_failure_outcome.assert_outcomes(passed=0, errors=1)
     assert (
@@ -0,0 +1,228 @@
+"""Embrace(cache_key=...) reuses runner results for rows with the same inputs."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass, field
+    from typing import List
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class SquareCase:
+        x: int
+        expected: int
+        tags: List[str] = field(default_factory=list)
+
+
+    calls = []
+
+
+    def square(case: SquareCase) -> int:
+        calls.append(case.x)
+        return case.x**2
+
+
+    by_fields = Embrace(SquareCase, cache_key=("x",))
+
+
+    @by_fields.fixture
+    def by_fields_case(case: SquareCase) -> int:
+        return square(case)
+
+
+    by_callable = Embrace(SquareCase, cache_key=lambda case: case.tags)
+
+
+    @by_callable.fixture
+    def by_callable_case(case: SquareCase) -> int:
+        return square(case)
+
+
+    tiny = Embrace(SquareCase, cache_key=("x",), cache_size=1)
+
+
+    @tiny.fixture
+    def tiny_case(case: SquareCase) -> int:
+        return square(case)
+    """
+)
+
+
+def test_same_fields_run_once(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import SquareCase, calls
+
+        table = [
+            SquareCase(x=2, expected=4),
+            SquareCase(x=2, expected=4, tags=["again"]),
+            SquareCase(x=3, expected=9),
+            SquareCase(x=2, expected=4, tags=["and again"]),
+        ]
+
+
+        def test(by_fields_case):
+            assert by_fields_case.actual_result == by_fields_case.case.expected
+
+
+        def test_calls():
+            assert calls == [2, 3]
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=5)
+
+
+def test_unhashable_keys(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import SquareCase, calls
+
+        table = [
+            SquareCase(x=2, expected=4, tags=["a"]),
+            SquareCase(x=2, expected=4, tags=["a"]),
+            SquareCase(x=3, expected=9, tags=["b"]),
+        ]
+
+
+        def test(by_callable_case):
+            assert by_callable_case.actual_result == by_callable_case.case.expected
+
+
+        def test_calls():
+            assert calls == [2, 3]
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=4)
+
+
+def test_least_recently_used_are_evicted(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import SquareCase, calls
+
+        table = [
+            SquareCase(x=2, expected=4),
+            SquareCase(x=3, expected=9),
+            SquareCase(x=2, expected=4),
+            SquareCase(x=2, expected=4),
+        ]
+
+
+        def test(tiny_case):
+            assert tiny_case.actual_result == tiny_case.case.expected
+
+
+        def test_calls():
+            assert calls == [2, 3, 2]
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=5)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        'cache_key=("nope",)',
+        'cache_key="x"',
+        'cache_key=("x",), cache_size=0',
+        'cache_key=("x",), concurrency=2',
+    ],
+)
+def test_bad_cache_config(pytester: pytest.Pytester, kwargs: str) -> None:
+    pytester.makepyfile(
+        f"""
+        import pytest
+
+        from conftest import SquareCase
+        from pytest_embrace import Embrace
+        from pytest_embrace.exc import CaseConfigurationError
+
+
+        def test():
+            with pytest.raises(CaseConfigurationError):
+                Embrace(SquareCase, {kwargs})
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
+
+
+def test_other_fixtures_are_part_of_the_key(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from conftest import SquareCase
+        from pytest_embrace import Embrace
+
+        calls = []
+
+
+        @pytest.fixture(params=["a", "b"])
+        def backend(request):
+            return request.param
+
+
+        by_backend = Embrace(SquareCase, cache_key=("x",))
+
+
+        @by_backend.fixture
+        def by_backend_case(case: SquareCase, backend: str) -> str:
+            calls.append((case.x, backend))
+            return f"{backend}{case.x}"
+
+
+        table = [SquareCase(x=2, expected=4), SquareCase(x=2, expected=4)]
+
+
+        def test(by_backend_case, backend):
+            assert by_backend_case.actual_result == f"{backend}2"
+
+
+        def test_calls():
+            assert sorted(calls) == [(2, "a"), (2, "b")]
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=5)
+
+
+def test_request_refused(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import SquareCase
+        from pytest_embrace import Embrace
+
+        requesting = Embrace(SquareCase, cache_key=("x",))
+
+
+        @requesting.fixture
+        def requesting_case(case: SquareCase, request) -> int:
+            return case.x**2
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.stdout.fnmatch_lines(["*takes `request`*cache_key*"])
+
+
+def test_yielding_runners_refused(pytester: pytest.Pytester) -> None:
+    # the first row's cleanup would run before later rows used its result
+    pytester.makepyfile(
+        """
+        from conftest import SquareCase
+        from pytest_embrace import Embrace
+
+        yielding = Embrace(SquareCase, cache_key=("x",))
+
+
+        @yielding.fixture
+        def yielding_case(case: SquareCase):
+            yield case.x**2
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.stdout.fnmatch_lines(["*cleans up after each row*cache_key*"])
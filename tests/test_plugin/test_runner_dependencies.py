@@ -0,0 +1,73 @@
+"""The fixtures a runner takes are declared to pytest, which resolves them
+like the dependencies of any other fixture."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+
+    import pytest
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class DepCase:
+        name: str
+
+
+    @pytest.fixture(scope="module")
+    def greeting() -> str:
+        return "hello"
+
+
+    embrace = Embrace(DepCase)
+
+
+    @embrace.fixture
+    def dep_case(greeting: str, case: DepCase, request) -> str:
+        assert request.fixturename == "dep_case"
+        return f"{greeting} {case.name}"
+
+
+    broken = Embrace(DepCase)
+
+
+    @broken.fixture
+    def broken_case(case: DepCase, no_such_fixture) -> None:
+        pass
+    """
+)
+
+
+def test_dependencies_are_known_to_pytest(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        name = "world"
+
+
+        def test(dep_case, request):
+            assert dep_case.actual_result == "hello world"
+            assert "greeting" in request.fixturenames
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
+
+
+def test_missing_dependencies_are_reported(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        name = "world"
+
+
+        def test(broken_case):
+            pass
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(errors=1)
+    outcome.stdout.fnmatch_lines(["*fixture 'no_such_fixture' not found*"])
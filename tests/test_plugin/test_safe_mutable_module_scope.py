@@ -14,6 +14,7 @@ _ = make_autouse_conftest(
         from dataclasses import dataclass
         from typing import Dict, List
         from pytest_embrace import Embrace
+        from pytest_embrace.case import trickles
 
 
         @dataclass
@@ -27,6 +28,34 @@ _ = make_autouse_conftest(
         @mut_config.fixture
         def mut_case(case: MutableCase):
             return None
+
+
+        @dataclass
+        class EnvCase:
+            name: str
+            env: str = trickles()
+            region: str = trickles(no_override=True)
+
+
+        env_config = Embrace(EnvCase)
+
+
+        @env_config.fixture
+        def env_case(case: EnvCase):
+            return None
+
+
+        @dataclass
+        class ItemsCase:
+            items: List[int]
+
+
+        items_config = Embrace(ItemsCase)
+
+
+        @items_config.fixture
+        def items_case(case: ItemsCase):
+            return None
         """
 )
 
@@ -53,3 +82,102 @@ outcome = make_test_run_outcome_fixture(
 
 def test(outcome: pytest.RunResult) -> None:
     outcome.assert_outcomes(passed=2)
+
+
+@pytest.mark.parametrize("isolation", ["snapshot", "reload"])
+def test_isolation_strategies(pytester: pytest.Pytester, isolation: str) -> None:
+    pytester.makeini(f"[pytest]\nembrace_module_isolation = {isolation}")
+    pytester.makepyfile(
+        test_first="""
+            mut = {"foo": 1}
+
+
+            def test(mut_case):
+                assert mut_case.case.mut == {"foo": 1}
+            """,
+        test_second="""
+            from test_first import mut
+
+            mut['bar'] = 6
+
+
+            def test(mut_case):
+                assert mut_case.case.mut == {"foo": 1, "bar": 6}
+            """,
+    )
+    pytester.runpytest().assert_outcomes(passed=2)
+
+
+@pytest.mark.parametrize("isolation", ["snapshot", "reload"])
+def test_imported_table_trickles_importers_values(
+    pytester: pytest.Pytester, isolation: str
+) -> None:
+    pytester.makeini(f"[pytest]\nembrace_module_isolation = {isolation}")
+    pytester.makepyfile(
+        test_a="""
+            from conftest import EnvCase
+
+            env = "a"
+            region = "north"
+            table = [EnvCase(name="one"), EnvCase(name="two")]
+
+
+            def test(env_case):
+                assert (env_case.case.env, env_case.case.region) == ("a", "north")
+            """,
+        test_b="""
+            from test_a import table
+
+            env = "b"
+            region = "south"
+
+
+            def test(env_case):
+                assert (env_case.case.env, env_case.case.region) == ("b", "south")
+            """,
+    )
+    pytester.runpytest().assert_outcomes(passed=4)
+
+
+@pytest.mark.parametrize("isolation", ["snapshot", "reload"])
+def test_rows_mutated_by_tests_do_not_leak(
+    pytester: pytest.Pytester, isolation: str
+) -> None:
+    pytester.makeini(f"[pytest]\nembrace_module_isolation = {isolation}")
+    pytester.makepyfile(
+        test_a="""
+            from conftest import ItemsCase
+
+            table = [ItemsCase(items=[])]
+
+
+            def test(items_case):
+                items_case.case.items.append(1)
+            """,
+        test_b="""
+            from test_a import table
+
+
+            def test(items_case):
+                assert items_case.case.items == []
+            """,
+    )
+    pytester.runpytest().assert_outcomes(passed=2)
+
+
+def test_snapshot_imports_module_once(pytester: pytest.Pytester) -> None:
+    # snapshot is the default
+    pytester.makepyfile(
+        test_imported="""
+            with open("imports.log", "a") as log:
+                log.write("imported\\n")
+
+            mut = {"foo": 1}
+
+
+            def test(mut_case):
+                ...
+            """
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
+    assert (pytester.path / "imports.log").read_text().splitlines() == ["imported"]
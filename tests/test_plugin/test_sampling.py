@@ -0,0 +1,114 @@
+"""--embrace-sample runs a repeatable subset of each table's rows."""
+from __future__ import annotations
+
+import re
+from typing import List
+
+import pytest
+
+from pytest_embrace.sampling import Sample
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class ColorCase:
+        color: str
+        n: int
+
+
+    embrace = Embrace(ColorCase, ids="index")
+
+
+    @embrace.fixture
+    def color_case(case: ColorCase) -> int:
+        return case.n
+    """
+)
+
+MODULE = """
+from conftest import ColorCase
+
+table = [
+    *[ColorCase(color="red", n=i) for i in range(90)],
+    *[ColorCase(color="blue", n=i) for i in range(9)],
+    ColorCase(color="green", n=0),
+    ColorCase(color="black", n={black}),
+]
+
+
+def test(color_case):
+    assert color_case.case.color != "black"
+"""
+VALID = MODULE.format(black=0)
+# validating the last row fails the module
+INVALID = MODULE.format(black='"zero"')
+
+
+def sampled(pytester: pytest.Pytester, *args: str) -> List[int]:
+    result = pytester.runpytest("-v", *args)
+    return [int(i) for i in re.findall(r"test\[(\d+)\] ", result.stdout.str())]
+
+
+def test_count(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_colors=VALID)
+    assert len(sampled(pytester, "--embrace-sample", "10")) == 10
+
+
+def test_percent(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_colors=VALID)
+    assert len(sampled(pytester, "--embrace-sample=5%")) == 6  # rounded up
+
+
+def test_repeatable(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_colors=VALID)
+    first = sampled(pytester, "--embrace-sample", "10")
+    assert sampled(pytester, "--embrace-sample", "10") == first
+    other_seed = sampled(
+        pytester, "--embrace-sample", "10", "--embrace-sample-seed", "1"
+    )
+    assert other_seed != first
+
+
+def test_stratified_covers_every_value(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_colors=VALID)
+    result = pytester.runpytest(
+        "-v", "--embrace-sample=10", "--embrace-sample-by=color"
+    )
+    # one row each for the 3 small colors leaves red 8 of its 8.9 fair share
+    result.assert_outcomes(passed=10, failed=1)
+    picked = [int(i) for i in re.findall(r"test\[(\d+)\] ", result.stdout.str())]
+    assert len([i for i in picked if i < 90]) == 8
+    assert len([i for i in picked if 90 <= i < 99]) == 1
+    assert 99 in picked and 100 in picked
+
+
+def test_unsampled_rows_are_not_validated(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_colors=INVALID)
+    expected = Sample(count=1).select(
+        [(i, i) for i in range(101)], module="test_colors"
+    )
+    assert expected != [(100, 100)]
+
+    result = pytester.runpytest("--embrace-sample=1")
+    result.assert_outcomes(passed=1)
+    result = pytester.runpytest("--embrace-sample=1", "--embrace-sample-by=color")
+    result.stdout.fnmatch_lines(["*1 invalid attr values in 1 rows*"])
+
+
+def test_unknown_attribute(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_colors=VALID)
+    result = pytester.runpytest("--embrace-sample=1", "--embrace-sample-by=shade")
+    result.stdout.fnmatch_lines(["*Can't sample test_colors by 'shade'*"])
+
+
+@pytest.mark.parametrize("spec", ["0", "1.5", "0%", "101%", "some"])
+def test_bad_spec(pytester: pytest.Pytester, spec: str) -> None:
+    result = pytester.runpytest(f"--embrace-sample={spec}")
+    result.stderr.fnmatch_lines(["*--embrace-sample: *"])
@@ -0,0 +1,170 @@
+"""Embrace(scope=...) shares a runner's setup across a module's or session's rows.
+The runner yields a function of the case, run once for each row."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    import asyncio
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class QueryCase:
+        query: str
+
+
+    setups = []
+
+    per_module = Embrace(QueryCase, scope="module")
+
+
+    @per_module.fixture
+    def module_case():
+        setups.append("module")
+        connection = {"open": True}
+
+        def run(case: QueryCase) -> str:
+            assert connection["open"]
+            return case.query.upper()
+
+        yield run
+        connection["open"] = False
+        print("Closing module connection")
+
+
+    per_session = Embrace(QueryCase, scope="session")
+
+
+    @per_session.fixture
+    async def session_case():
+        setups.append("session")
+
+        async def run(case: QueryCase) -> str:
+            await asyncio.sleep(0)
+            return case.query[::-1]
+
+        return run
+    """
+)
+
+MODULE_TEMPLATE = """
+from conftest import QueryCase, setups
+
+table = [QueryCase(query="select"), QueryCase(query="insert")]
+
+
+def test({fixture}):
+    assert {fixture}.actual_result == {expected}
+    assert setups.count("{scope}") == {setups}
+"""
+
+
+def test_module_scope(pytester: pytest.Pytester) -> None:
+    for name, setups in (("test_a", 1), ("test_b", 2)):
+        pytester.makepyfile(
+            **{
+                name: MODULE_TEMPLATE.format(
+                    fixture="module_case",
+                    expected="module_case.case.query.upper()",
+                    scope="module",
+                    setups=setups,
+                )
+            }
+        )
+    outcome = pytester.runpytest("-s")
+    outcome.assert_outcomes(passed=4)
+    outcome.stdout.fnmatch_lines(
+        ["*Closing module connection*", "*Closing module connection*"]
+    )
+
+
+def test_session_scope(pytester: pytest.Pytester) -> None:
+    template = MODULE_TEMPLATE.format(
+        fixture="session_case",
+        expected="session_case.case.query[::-1]",
+        scope="session",
+        setups=1,
+    )
+    pytester.makepyfile(test_a=template, test_b=template)
+    pytester.runpytest().assert_outcomes(passed=4)
+
+
+def test_scoped_runners_must_not_take_case(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from conftest import QueryCase
+        from pytest_embrace import Embrace
+        from pytest_embrace.exc import CaseConfigurationError
+
+
+        def test():
+            embrace = Embrace(QueryCase, scope="module")
+            with pytest.raises(CaseConfigurationError, match="can't take `case`"):
+
+                @embrace.fixture
+                def takes_case(case: QueryCase):
+                    pass
+        """
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
+
+
+def test_scoped_runners_must_give_a_function(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import QueryCase
+        from pytest_embrace import Embrace
+
+        embrace = Embrace(QueryCase, scope="module")
+
+
+        @embrace.fixture
+        def not_a_function():
+            return 5
+
+
+        query = "select"
+
+
+        def test(not_a_function):
+            pass
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(errors=1)
+    outcome.stdout.fnmatch_lines(["*must return or yield a function*"])
+
+
+def test_narrower_dependencies_refused(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from conftest import QueryCase
+        from pytest_embrace import Embrace
+
+        embrace = Embrace(QueryCase, scope="module")
+
+
+        @embrace.fixture
+        def temporary_case(tmp_path):
+            # every other row would get the first row's directory
+            return lambda case: tmp_path
+
+
+        table = [QueryCase(query="select"), QueryCase(query="insert")]
+
+
+        def test(temporary_case):
+            pass
+        """
+    )
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(errors=2)
+    outcome.stdout.fnmatch_lines(["*ScopeMismatch*function scoped fixture tmp_path*"])
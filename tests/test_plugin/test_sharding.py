@@ -0,0 +1,126 @@
+"""--embrace-shard=i/n splits each table's rows between n CI nodes."""
+from __future__ import annotations
+
+import json
+import re
+from typing import List
+
+import pytest
+
+from pytest_embrace.sharding import pack
+
+from .utils import make_autouse_conftest
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+    from typing import Any
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class RowCase:
+        n: int
+        extra: Any = None
+
+
+    embrace = Embrace(RowCase, ids="index")
+
+
+    @embrace.fixture
+    def row_case(case: RowCase) -> int:
+        return case.n
+    """
+)
+
+MODULE = """
+from conftest import RowCase
+
+table = [RowCase(n=i) for i in range(30)] + [RowCase(n={last})]
+
+
+def test(row_case):
+    pass
+
+
+def test_again(row_case):
+    pass
+"""
+VALID = MODULE.format(last=30)
+# validating the last row fails the module
+INVALID = MODULE.format(last='"thirty"')
+# plain objects hash differently in every process, so these go by index
+UNSTABLE = """
+from conftest import RowCase
+
+table = [RowCase(n=i, extra=object()) for i in range(30)]
+
+
+def test(row_case):
+    pass
+"""
+
+
+def sharded(pytester: pytest.Pytester, *args: str) -> List[int]:
+    result = pytester.runpytest("--collect-only", "-q", *args)
+    return [int(i) for i in re.findall(r"::test\[(\d+)\]", result.stdout.str())]
+
+
+@pytest.mark.parametrize("durations", [(), ("--embrace-shard-durations",)])
+def test_shards_split_rows(pytester: pytest.Pytester, durations: List[str]) -> None:
+    pytester.makepyfile(test_rows=VALID)
+    pytester.runpytest(*durations)  # record any durations first
+    shards = [
+        sharded(pytester, f"--embrace-shard={i}/3", *durations) for i in (1, 2, 3)
+    ]
+    assert all(shards)
+    assert sorted(row for shard in shards for row in shard) == [*range(31)]
+
+
+@pytest.mark.parametrize("durations", [(), ("--embrace-shard-durations",)])
+def test_rows_without_stable_hash_split_by_index(
+    pytester: pytest.Pytester, durations: List[str]
+) -> None:
+    pytester.makepyfile(test_rows=UNSTABLE)
+    pytester.runpytest(*durations).assert_outcomes(passed=30)
+    shards = [
+        sharded(pytester, f"--embrace-shard={i}/3", *durations) for i in (1, 2, 3)
+    ]
+    assert all(shards)
+    assert sorted(row for shard in shards for row in shard) == [*range(30)]
+    assert sharded(pytester, "--embrace-shard=1/3", *durations) == shards[0]
+
+
+def test_other_shards_rows_are_not_validated(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_rows=INVALID)
+    results = [pytester.runpytest(f"--embrace-shard={i}/3") for i in (1, 2, 3)]
+    failed = [
+        result for result in results if "invalid attr values" in result.stdout.str()
+    ]
+    assert len(failed) == 1
+
+
+def test_durations_recorded(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_rows=VALID)
+    pytester.runpytest("--embrace-shard-durations").assert_outcomes(passed=62)
+    cached = pytester.path / ".pytest_cache" / "v" / "embrace" / "durations"
+    durations = json.loads(cached.read_text())
+    assert len(durations) == 31
+    assert all(key.startswith("test_rows:") for key in durations)
+
+    # they'd change how the other shards are packed
+    pytester.runpytest("--embrace-shard-durations", "--embrace-shard=1/2")
+    assert json.loads(cached.read_text()) == durations
+
+
+def test_longest_first_packing() -> None:
+    durations = {"a": 3.0, "b": 2.0, "c": 1.0, "d": 1.0, "e": 0.5}
+    # a; b; c joins b (2 < 3); d joins a (tied, so the first shard); e joins b
+    assert pack(durations, 2) == {"a": 0, "b": 1, "c": 1, "d": 0, "e": 1}
+
+
+@pytest.mark.parametrize("spec", ["0/2", "3/2", "1", "one/two"])
+def test_bad_spec(pytester: pytest.Pytester, spec: str) -> None:
+    result = pytester.runpytest(f"--embrace-shard={spec}")
+    result.stderr.fnmatch_lines(["*--embrace-shard: *"])
@@ -0,0 +1,103 @@
+"""A module's cases are loaded once per Embrace fixture, however many of its tests
+request them. Each test function still gets cases of its own."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest, make_test_run_outcome_fixture
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+
+    from pytest_embrace import Embrace
+    from pytest_embrace.case import trickles
+
+
+    @dataclass
+    class LoadCase:
+        name: str
+        tag: str = trickles()
+
+
+    # ids are made while loading, so counting them counts the loads
+    made_ids = []
+
+
+    def numbered(case: LoadCase) -> str:
+        made_ids.append(case.name)
+        return f"{case.name}{len(made_ids)}"
+
+
+    embrace = Embrace(LoadCase, ids=numbered)
+
+
+    @embrace.fixture
+    def load_case(case: LoadCase) -> str:
+        return case.name
+
+
+    other = Embrace(LoadCase, ids=numbered)
+
+
+    @other.fixture
+    def other_load_case(case: LoadCase) -> str:
+        return case.tag
+    """
+)
+
+outcome = make_test_run_outcome_fixture(
+    test_shared="""
+    from conftest import LoadCase
+
+    tag = "shared"
+    table = [LoadCase(name="a"), LoadCase(name="b")]
+    seen = []
+
+
+    def test_one(load_case):
+        seen.append(load_case.case)
+        load_case.case.tag = "mutated"
+
+
+    def test_two(load_case):
+        assert all(case is not load_case.case for case in seen)
+        assert load_case.case.tag == "shared"
+        load_case.case.tag = "mutated again"
+
+
+    def test_two_again(load_case):
+        assert load_case.case.tag == "shared"
+
+
+    def test_three(other_load_case):
+        assert other_load_case.actual_result == "shared"
+
+
+    def test_four(load_case, case):
+        assert isinstance(case, LoadCase)
+        assert case is load_case.case
+    """,
+    pytest_args=("-v",),
+)
+
+
+def test_functions_get_their_own_cases(outcome: pytest.RunResult) -> None:
+    outcome.assert_outcomes(passed=10)
+
+
+def test_loaded_once_per_fixture(outcome: pytest.RunResult) -> None:
+    outcome.stdout.fnmatch_lines_random(
+        [
+            "*test_one?a1? PASSED*",
+            "*test_one?b2? PASSED*",
+            "*test_two?a1? PASSED*",
+            "*test_two?b2? PASSED*",
+            "*test_two_again?a1? PASSED*",
+            "*test_two_again?b2? PASSED*",
+            "*test_three?a3? PASSED*",
+            "*test_three?b4? PASSED*",
+            "*test_four?a1? PASSED*",
+            "*test_four?b2? PASSED*",
+        ]
+    )
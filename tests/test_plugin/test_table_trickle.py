@@ -176,3 +176,27 @@ def test_cant_be_totally_missing(pytester: pytest.Pytester) -> None:
             "*'beverage' is unset at the module level and in table[0*"
         ]
     )
+
+
+TEST_MODULE_GENERATES_TABLE = """
+from conftest import TrickleCase
+
+beverage = 'just water, thanks'
+ounces_of_beverage = 16
+
+
+def table():
+    for snack in ('dates', 'figs', 'olives'):
+        yield TrickleCase(snack=snack)
+
+
+def test(trickle_case):
+    assert trickle_case.case.beverage == 'just water, thanks'
+"""
+
+
+def test_lazy_table(pytester: pytest.Pytester) -> None:
+    """`table` can be a function that generates cases."""
+    pytester.makepyfile(TEST_MODULE_GENERATES_TABLE)
+    outcome = pytester.runpytest()
+    outcome.assert_outcomes(passed=3)
@@ -0,0 +1,124 @@
+"""--embrace-validate-workers validates tables on worker processes during
+collection. Invalid modules fail to collect once the results are joined."""
+from __future__ import annotations
+
+import pytest
+
+from .utils import make_autouse_conftest, make_test_run_outcome_fixture
+
+_ = make_autouse_conftest(
+    """
+    from dataclasses import dataclass
+    from typing import Any
+
+    from pytest_embrace import Embrace
+
+
+    @dataclass
+    class Point:
+        x: int
+        extra: Any = None
+
+
+    @dataclass
+    class PointCase:
+        # nested, so rows can't skip pydantic and really go to the workers
+        point: Point
+        label: str
+
+
+    embrace = Embrace(PointCase)
+
+
+    @embrace.fixture
+    def point_case(case: PointCase) -> int:
+        return case.point.x
+    """
+)
+
+VALID = """
+from conftest import Point, PointCase
+
+table = [PointCase(Point(x=i), label=str(i)) for i in range(1500)]
+
+
+def test(point_case):
+    assert point_case.actual_result == point_case.case.point.x
+"""
+
+INVALID = """
+from conftest import Point, PointCase
+
+table = [
+    PointCase(Point(x=1), label="fine"),
+    PointCase(Point(x="one"), label="wrong"),
+    PointCase(Point(x=2), label=3),
+]
+
+
+def test(point_case):
+    pass
+"""
+
+# lambdas don't pickle, so these are validated in the main process after all
+UNPICKLABLE = """
+from conftest import Point, PointCase
+
+table = [PointCase(Point(x=1, extra=lambda: 1), label=1)]
+
+
+def test(point_case):
+    pass
+"""
+
+outcome = make_test_run_outcome_fixture(
+    test_valid=VALID,
+    test_invalid=INVALID,
+    test_unpicklable=UNPICKLABLE,
+    pytest_args=("--embrace-validate-workers", "2", "--continue-on-collection-errors"),
+)
+
+
+def test_valid_modules_pass(outcome: pytest.RunResult) -> None:
+    outcome.assert_outcomes(passed=1500, errors=2)
+
+
+def test_errors_name_module_and_rows(outcome: pytest.RunResult) -> None:
+    outcome.stdout.fnmatch_lines(
+        [
+            "2 invalid attr values in 2 rows of 'Module?test_invalid?.table':",
+            "  table?1?PointCase(point=Point(x='one'*",
+            "*Variable/Arg 'point*' should be of type int*",
+            "  table?2?PointCase(*",
+            "*Variable/Arg 'label' should be of type str*",
+        ]
+    )
+
+
+def test_unpicklable_cases_still_validated(outcome: pytest.RunResult) -> None:
+    outcome.stdout.fnmatch_lines(
+        ["1 invalid attr values in 1 rows of 'Module?test_unpicklable?.table':"]
+    )
+
+
+@pytest.mark.parametrize("workers", ["0", "2"])
+def test_invalid_modules_fail_collection(
+    pytester: pytest.Pytester, workers: str
+) -> None:
+    pytester.makepyfile(test_valid=VALID, test_invalid=INVALID)
+    result = pytester.runpytest("--embrace-validate-workers", workers)
+    assert result.ret == pytest.ExitCode.INTERRUPTED
+    result.stdout.fnmatch_lines(["*Interrupted: 1 error during collection*"])
+
+    result = pytester.runpytest(
+        "--collect-only", "-q", "--embrace-validate-workers", workers
+    )
+    assert result.ret == pytest.ExitCode.INTERRUPTED
+    result.stdout.fnmatch_lines(
+        ["ERROR test_invalid.py*", "1500*tests collected*1 error*"]
+    )
+
+
+def test_negative_workers_rejected(pytester: pytest.Pytester) -> None:
+    result = pytester.runpytest("--embrace-validate-workers", "-1")
+    result.stderr.fnmatch_lines(["*--embrace-validate-workers must be at least 0*"])
@@ -0,0 +1,158 @@
+"""Under pytest-xdist, only one worker loads and validates each Embrace module."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from textwrap import dedent
+from typing import Tuple
+
+import pytest
+
+from pytest_embrace.preload import Publication
+from tests.conftest import ModuleInfoFactory
+
+pytest.importorskip("xdist")
+
+CONFTEST = """
+from dataclasses import dataclass
+from pathlib import Path
+
+from pytest_embrace import Embrace
+
+
+@dataclass
+class SpreadCase:
+    number: int
+
+
+embrace = Embrace(SpreadCase)
+
+
+@embrace.fixture
+def spread_case(case: SpreadCase) -> int:
+    return case.number * 2
+
+
+def logged_table(name, rows):
+    def table():
+        with (Path({log_dir!r}) / "loads.log").open("a") as log:
+            log.write(name + "\\n")
+        return (SpreadCase(number=n) for n in range(rows))
+
+    return table
+"""
+
+TEST_MODULE = """
+from conftest import logged_table
+
+table = logged_table(__name__, 20)
+
+
+def test(spread_case):
+    assert spread_case.actual_result == spread_case.case.number * 2
+"""
+
+
+@pytest.fixture
+def log_path(pytester: pytest.Pytester) -> str:
+    pytester.makeconftest(dedent(CONFTEST.format(log_dir=str(pytester.path))))
+    return str(pytester.path / "loads.log")
+
+
+def test_one_worker_loads_each_module(pytester: pytest.Pytester, log_path: str) -> None:
+    pytester.makepyfile(test_a=TEST_MODULE, test_b=TEST_MODULE)
+    outcome = pytester.runpytest("-n", "3")
+    outcome.assert_outcomes(passed=40)
+    with open(log_path) as log:
+        assert sorted(log.read().split()) == ["test_a", "test_b"]
+
+
+def test_tests_taking_case_get_cases(pytester: pytest.Pytester, log_path: str) -> None:
+    pytester.makepyfile(
+        **{
+            name: TEST_MODULE
+            + dedent(
+                """
+
+                def test_case(spread_case, case):
+                    assert type(case).__name__ == "SpreadCase"
+                    assert case is spread_case.case
+                """
+            )
+            for name in ("test_a", "test_b")
+        }
+    )
+    outcome = pytester.runpytest("-n", "3")
+    outcome.assert_outcomes(passed=80)
+
+
+def test_errors_reach_every_worker(pytester: pytest.Pytester, log_path: str) -> None:
+    pytester.makepyfile(
+        test_bad="""
+        from conftest import SpreadCase
+
+        table = [SpreadCase(number="one")]
+
+
+        def test(spread_case):
+            ...
+        """
+    )
+    outcome = pytester.runpytest("-n", "2")
+    # each worker reports the collection error, like they would without preloading
+    outcome.assert_outcomes(errors=2)
+    outcome.stdout.fnmatch_lines(
+        ["*1 invalid attr values in 1 rows*", "*1 invalid attr values in 1 rows*"]
+    )
+
+
+@dataclass
+class WaitedCase:
+    number: int
+
+
+@pytest.fixture
+def publications(
+    tmp_path: Path, module_info_factory: ModuleInfoFactory
+) -> Tuple[Publication, Publication]:
+    info = module_info_factory.build(WaitedCase, fixture_name="waited_case")
+    claimer, waiter = Publication(tmp_path, info), Publication(tmp_path, info)
+    assert claimer.claim()
+    assert not waiter.claim()
+    return claimer, waiter
+
+
+def test_waiting_stops_when_claimer_dies(
+    publications: Tuple[Publication, Publication]
+) -> None:
+    claimer, waiter = publications
+    claimer._release()  # what the OS does for a worker that dies
+    with pytest.warns(pytest.PytestWarning, match="the worker loading it stopped"):
+        assert waiter.subscribe() is None
+
+
+def test_claim_released_when_publishing_fails(
+    publications: Tuple[Publication, Publication], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    claimer, waiter = publications
+
+    def broken(meta: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(claimer, "_write_meta", broken)
+    with pytest.raises(OSError):
+        claimer.publish([WaitedCase(1)], ["1"])
+    with pytest.warns(pytest.PytestWarning, match="the worker loading it stopped"):
+        assert waiter.subscribe() is None
+
+
+def test_published_cases_reach_waiter(
+    publications: Tuple[Publication, Publication]
+) -> None:
+    claimer, waiter = publications
+    claimer.publish([WaitedCase(1), WaitedCase(2)], ["a", "b"])
+    published = waiter.subscribe()
+    assert published is not None
+    cases, ids = published
+    assert ids == ["a", "b"]
+    assert [case.resolve() for case in cases] == [WaitedCase(1), WaitedCase(2)]